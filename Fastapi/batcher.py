@@ -0,0 +1,97 @@
+import asyncio
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-text requests into batches.
+
+    Requests wait at most max_wait_ms for company, a batch never exceeds
+    max_batch_size, and each batch is scored by one score_fn call on a
+    worker thread so the event loop keeps accepting requests.
+    """
+
+    def __init__(self, score_fn, max_batch_size: int = 64, max_wait_ms: float = 5):
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = None
+        self.worker = None
+        self.batch = []
+        self.batches = 0
+
+    def start(self) -> None:
+        # Started lazily from the first request, inside the serving loop:
+        if self.worker is None or self.worker.done():
+            self.queue = asyncio.Queue()
+            self.worker = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.worker is not None:
+            self.worker.cancel()
+            try:
+                await self.worker
+            except asyncio.CancelledError:
+                pass
+            self.worker = None
+
+        # Fail whoever still waits, in the cancelled batch or in the queue:
+        pending = self.batch
+        while self.queue is not None and not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("MicroBatcher stopped before scoring the request."))
+        self.batch = []
+
+    async def submit(self, text: str) -> tuple:
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((text, future))
+        return await future
+
+    async def collect(self) -> list:
+        # Gather into self.batch, so stop() also sees requests that were
+        # dequeued while waiting for company:
+        loop = asyncio.get_running_loop()
+        batch = self.batch = [await self.queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    def score(self, texts: list) -> tuple:
+        # Errors are caught on the worker thread so their traceback never
+        # holds the run() frame (callers clearing it would kill the loop):
+        try:
+            return self.score_fn(texts), None
+        except Exception as e:
+            return None, e
+
+    async def run(self) -> None:
+        while True:
+            batch = await self.collect()
+            texts = [text for text, _ in batch]
+
+            result, error = await asyncio.to_thread(self.score, texts)
+            if error is not None:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                self.batch = []
+                continue
+
+            labels, probabilities = result
+
+            self.batches += 1
+            for (_, future), label, probability in zip(batch, labels, probabilities):
+                # The caller may have gone away (e.g. client disconnect):
+                if not future.done():
+                    future.set_result((label, probability))
+            self.batch = []
@@ -0,0 +1,176 @@
+import argparse
+import csv
+import io
+import itertools
+import json
+import os
+import sys
+import time
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+FIELDS = ["id", "label", "probability", "error"]
+
+
+class RowError(ValueError):
+    """A record that can't be scored, reported in place of its result."""
+
+
+class Throughput:
+    """Rows scored so far and the rate since the stream started."""
+
+    def __init__(self):
+        self.rows = 0
+        self.errors = 0
+        self.start = time.perf_counter()
+
+    def add(self, n_rows: int, n_errors: int = 0) -> None:
+        self.rows += n_rows
+        self.errors += n_errors
+
+    def summary(self) -> dict:
+        seconds = time.perf_counter() - self.start
+        return {"rows": self.rows, "errors": self.errors, "seconds": seconds,
+                "rows_per_sec": self.rows / seconds if seconds else 0.0}
+
+    def __str__(self) -> str:
+        summary = self.summary()
+        return (f"{summary['rows']} rows ({summary['errors']} errors) in {summary['seconds']:.1f}s "
+                f"({summary['rows_per_sec']:.0f} rows/s)")
+
+
+def check_batch_size(batch_size: int) -> None:
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got {batch_size}.")
+
+
+def read_rows(lines, fmt: str = "ndjson"):
+    # (number, dict) per input record, pulled from lines (str, or UTF-8
+    # bytes) as they are needed. NDJSON records are numbered by line, CSV
+    # records by row after the header, both from 1. A malformed line becomes
+    # a RowError so the rows after it still get scored:
+    if fmt == "ndjson":
+        for number, line in enumerate(lines, start=1):
+            if isinstance(line, bytes):
+                try:
+                    line = line.decode("utf-8")
+                except UnicodeDecodeError as e:
+                    yield number, RowError(f"line {number}: invalid UTF-8 ({e.reason})")
+                    continue
+            if line.strip():
+                try:
+                    yield number, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield number, RowError(f"line {number}: invalid JSON ({e.msg})")
+    elif fmt == "csv":
+        # A CSV record may span lines, undecodable bytes become U+FFFD:
+        rows = csv.DictReader(line.decode("utf-8", errors="replace") if isinstance(line, bytes) else line
+                              for line in lines)
+        yield from enumerate(rows, start=1)
+    else:
+        raise ValueError(f"Unsupported bulk format {fmt}, expected one of {sorted(MEDIA_TYPES)}.")
+
+
+def row_error(row, text_field: str):
+    if isinstance(row, RowError):
+        return str(row)
+    if not isinstance(row, dict):
+        return "record is not an object"
+    if not isinstance(row.get(text_field), str):
+        return f"missing text field {text_field}"
+    return None
+
+
+def score_batches(rows, score_fn, normalize_fn, batch_size: int = 1000, text_field: str = "text",
+                  id_field: str = "id", throughput: Throughput = None):
+    check_batch_size(batch_size)
+
+    # Fixed-size batches of (number, row), so memory doesn't grow with the
+    # input; the record number stands in for a missing id:
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            return
+
+        ids = [row.get(id_field, number) if isinstance(row, dict) else number for number, row in batch]
+        errors = [row_error(row, text_field) for _, row in batch]
+        batch = [row for _, row in batch]
+        valid = [i for i, error in enumerate(errors) if error is None]
+
+        # Invalid rows get an error record in their place, the rest is scored:
+        results = [{"id": ids[i], "error": error} for i, error in enumerate(errors)]
+        if valid:
+            labels, probabilities = score_fn([normalize_fn(batch[i][text_field]) for i in valid])
+            for i, label, probability in zip(valid, labels, probabilities):
+                results[i] = {"id": ids[i], "label": int(label), "probability": float(probability)}
+
+        if throughput is not None:
+            throughput.add(len(batch), len(batch) - len(valid))
+        yield results
+
+
+def format_batch(results: list, fmt: str = "ndjson", header: bool = False) -> str:
+    if fmt == "ndjson":
+        return "".join(json.dumps(result) + "\n" for result in results)
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDS, lineterminator="\n")
+    if header:
+        writer.writeheader()
+    writer.writerows(results)
+    return buffer.getvalue()
+
+
+def score_stream(lines, score_fn, normalize_fn, fmt: str = "ndjson", batch_size: int = 1000,
+                 text_field: str = "text", id_field: str = "id", throughput: Throughput = None):
+    # Formatted output, one chunk per scored batch:
+    batches = score_batches(read_rows(lines, fmt), score_fn, normalize_fn, batch_size,
+                            text_field, id_field, throughput)
+    for i, results in enumerate(batches):
+        yield format_batch(results, fmt, header=i == 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score NDJSON or CSV texts in fixed-size batches.")
+    parser.add_argument("input", help="Input file, - for stdin.")
+    parser.add_argument("-o", "--output", default="-", help="Output file, - for stdout.")
+    parser.add_argument("--format", choices=sorted(MEDIA_TYPES), default="ndjson")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--store", default=os.getenv("MODEL_STORE_DIR", os.path.join("models", "store")))
+    parser.add_argument("--native", action="store_true", help="Score with the exported NumPy arrays.")
+    parser.add_argument("--report-every", type=int, default=100, help="Batches between rate reports on stderr.")
+    args = parser.parse_args()
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    from Fastapi.model_store import LocalModelStore
+    from Fastapi.preprocessing import normalize_text, warm_lemma_cache
+
+    model = LocalModelStore(args.store).load(native=args.native)
+    warm_lemma_cache(model.feature_names)
+
+    # Read bytes, so one undecodable line is reported instead of ending the run:
+    source = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    target = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+
+    throughput = Throughput()
+    try:
+        chunks = score_stream(source, model.score, normalize_text, args.format, args.batch_size,
+                              args.text_field, args.id_field, throughput)
+        for i, chunk in enumerate(chunks, start=1):
+            target.write(chunk)
+            if args.report_every and i % args.report_every == 0:
+                print(f"Scored {throughput}", file=sys.stderr)
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    print(f"Scored {throughput} with model version {model.version}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
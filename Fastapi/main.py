@@ -1,34 +1,82 @@
-from fastapi import FastAPI, Request, Form
+from fastapi import FastAPI, Request, Form, HTTPException
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import  HTMLResponse
-import mlflow.pyfunc
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import  HTMLResponse, StreamingResponse
+from pydantic import BaseModel
 import os
-from Fastapi.preprocessing import normalize_text
-import pickle
-import pandas as pd
+import tempfile
+from Fastapi.bulk_scoring import MEDIA_TYPES, Throughput, check_batch_size, score_stream
+from Fastapi.batcher import MicroBatcher
+from Fastapi.model_store import LocalModelStore, connect_registry, refresh_from_registry
+from Fastapi.model_watcher import WARMUP_TEXTS, ModelWatcher, score_with_holders
+from Fastapi.prediction_cache import LocalBackend, PredictionCache
+from Fastapi.prefork import process_memory
+from Fastapi.preprocessing import normalize_text, warm_lemma_cache
 
 app = FastAPI()
 
-# load model from model registry:
-dagshub_token = os.getenv("DAGSHUB_PAT")
-if not dagshub_token:
-    raise EnvironmentError("DAGSHUB_PAT environment variable is not set.")
+class BatchRequest(BaseModel):
+    texts: list[str]
 
-os.environ["MLFLOW_TRACKING_USERNAME"] = dagshub_token
-os.environ["MLFLOW_TRACKING_PASSWORD"] = dagshub_token
+class Prediction(BaseModel):
+    label: int
+    probability: float
 
-dagshub_url = "https://dagshub.com"
-repo_owner = "PriyanshuMewal"
-repo_name = 'mini-project'
-
-mlflow.set_tracking_uri(f"{dagshub_url}/{repo_owner}/{repo_name}.mlflow")
+class BatchResponse(BaseModel):
+    predictions: list[Prediction]
 
 model_name = "emotion_detection"
 alias = "champion"
-
-model = mlflow.pyfunc.load_model(model_uri=f"models:/{model_name}@{alias}")
-
-print(model.model_id)
+store = LocalModelStore(os.getenv("MODEL_STORE_DIR", os.path.join("models", "store")))
+
+def refresh_store() -> None:
+    try:
+        connect_registry()
+        refresh_from_registry(store, model_name, alias, "models/vectorizer.pkl")
+    except Exception as e:
+        print("Background refresh from the model registry failed.")
+        print(e)
+
+def load_model(version: str = None):
+    # SCORER=native skips sklearn and scores with the exported NumPy arrays,
+    # NATIVE_MMAP=1 maps them from disk so every worker shares one copy:
+    model = store.load(version, native=os.getenv("SCORER", "sklearn") == "native",
+                       mmap=os.getenv("NATIVE_MMAP", "0") == "1")
+
+    # Pre-warm lemma cache with the vectorizer vocabulary:
+    warm_lemma_cache(model.feature_names)
+    return model
+
+# Serve the local store, the registry is only required on the very first start:
+if not store.exists():
+    connect_registry()
+    refresh_from_registry(store, model_name, alias, "models/vectorizer.pkl")
+
+# Pick up a newer champion off the request path, without a restart. Under
+# MODEL_STORE_OFFLINE=1 (e.g. Fastapi/prefork.py workers) only the local
+# store is polled:
+watcher = ModelWatcher(
+    store, load_model(),
+    load_fn=load_model,
+    refresh_fn=refresh_store if os.getenv("MODEL_STORE_OFFLINE", "0") != "1" else None,
+    warmup_texts=[normalize_text(text) for text in WARMUP_TEXTS],
+    interval=float(os.getenv("MODEL_POLL_INTERVAL", "60"))
+)
+
+print(watcher.holder.version)
+
+# Concurrent single predictions are scored together, each one by the
+# model that was served when its request came in:
+batcher = MicroBatcher(score_with_holders,
+                       max_batch_size=int(os.getenv("BATCH_MAX_SIZE", "64")),
+                       max_wait_ms=float(os.getenv("BATCH_MAX_WAIT_MS", "5")))
+
+# Repeated (normalized) texts skip vectorizing and scoring, only answers of
+# the model being served are stored:
+prediction_cache = PredictionCache(LocalBackend(
+    max_size=int(os.getenv("PREDICTION_CACHE_SIZE", "100000")),
+    ttl=float(os.getenv("PREDICTION_CACHE_TTL", "3600"))
+), current_version=lambda: watcher.holder.version)
 
 # Create template and render it:
 templates = Jinja2Templates(directory="Fastapi/templates")
@@ -43,21 +91,31 @@ def home(request: Request):
         }
     )
 
-@app.post("/predict")
-def predict(request: Request, text: str = Form(...)):
+# Started per worker, threads don't survive Fastapi/prefork.py's fork:
+@app.on_event("startup")
+def start_watcher():
+    if watcher.interval > 0:
+        watcher.start()
 
-    # preprocess text:
-    text = normalize_text(text)
+@app.on_event("shutdown")
+async def stop_batcher():
+    await batcher.stop()
+    watcher.stopped.set()
 
-    # feature engineering:
-    with open("models/vectorizer.pkl", "rb") as vector:
-        vectorizer = pickle.load(vector)
+@app.post("/predict")
+async def predict(request: Request, text: str = Form(...)):
 
-    text_trf = vectorizer.transform([text])
-    text_trf = pd.DataFrame(text_trf.toarray(), columns=vectorizer.get_feature_names_out())
+    # preprocess text (NLTK lemmatization, off the event loop):
+    text = await run_in_threadpool(normalize_text, text)
 
-    # predict and return prediction:
-    result = int(model.predict(text_trf)[0])
+    # feature engineering and prediction, batched with concurrent requests:
+    holder = watcher.holder
+    version = holder.version
+    cached = prediction_cache.get(text, version)
+    if cached is None:
+        cached = await batcher.submit((holder, text))
+        prediction_cache.set(text, cached, version)
+    result = int(cached[0])
 
     return templates.TemplateResponse(
         "index.html",
@@ -66,4 +124,77 @@ def predict(request: Request, text: str = Form(...)):
             "result": result,
             "text": text
         }
-    )
\ No newline at end of file
+    )
+
+@app.post("/predict/batch", response_model=BatchResponse)
+def predict_batch(batch: BatchRequest):
+
+    # preprocess, vectorize and score the whole batch at once:
+    texts = [normalize_text(text) for text in batch.texts]
+    if not texts:
+        return BatchResponse(predictions=[])
+
+    # Only score texts the cache doesn't know yet, each one once. One model
+    # answers the whole batch even if a reload lands meanwhile:
+    holder = watcher.holder
+    version = holder.version
+    results = {}
+    for text in texts:
+        if text not in results:
+            results[text] = prediction_cache.get(text, version)
+
+    missing = [text for text, value in results.items() if value is None]
+    if missing:
+        labels, probabilities = holder.score(missing)
+        for text, label, probability in zip(missing, labels, probabilities):
+            results[text] = (label, probability)
+            prediction_cache.set(text, results[text], version)
+
+    return BatchResponse(predictions=[
+        Prediction(label=int(results[text][0]), probability=float(results[text][1]))
+        for text in texts
+    ])
+
+@app.post("/predict/stream")
+async def predict_stream(request: Request, format: str = "ndjson", batch_size: int = 1000, text_field: str = "text"):
+    if format not in MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"format must be one of {sorted(MEDIA_TYPES)}")
+    try:
+        check_batch_size(batch_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Spool the upload to disk first, most clients only read the response
+    # once their whole body is sent. Disk writes stay off the event loop:
+    body = tempfile.TemporaryFile()
+    async for chunk in request.stream():
+        await run_in_threadpool(body.write, chunk)
+    body.seek(0)
+
+    # Read, score and write batch by batch; one model answers the whole stream:
+    holder = watcher.holder
+    throughput = Throughput()
+
+    def chunks():
+        try:
+            # Lines stay bytes, undecodable ones are reported per record:
+            yield from score_stream(body, holder.score, normalize_text, format,
+                                    batch_size, text_field, throughput=throughput)
+        finally:
+            body.close()
+        print(f"Streamed {throughput} with model version {holder.version}")
+
+    return StreamingResponse(chunks(), media_type=MEDIA_TYPES[format])
+
+@app.get("/cache/stats")
+def cache_stats():
+    return prediction_cache.stats()
+
+@app.get("/version")
+def version():
+    return watcher.status()
+
+@app.get("/memory")
+def memory():
+    # Memory of the worker that answered, see Fastapi/prefork.py:
+    return process_memory()
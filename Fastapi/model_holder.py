@@ -0,0 +1,53 @@
+import pickle
+
+import numpy as np
+from scipy import sparse
+
+
+class ModelHolder:
+    """Model and vectorizer loaded once per process.
+
+    Requests are scored straight from the sparse vectorizer output, without
+    re-reading the vectorizer or building a dense DataFrame.
+    """
+
+    def __init__(self, model, vectorizer, version: str = None):
+        self.model = model
+        self.vectorizer = vectorizer
+        self.version = version
+
+        # Feature names are computed once, hashing vectorizers have none:
+        self.feature_names = None
+        if hasattr(vectorizer, "vocabulary_"):
+            self.feature_names = vectorizer.get_feature_names_out()
+
+    @classmethod
+    def load(cls, model_uri: str, vectorizer_url: str = "models/vectorizer.pkl"):
+        import mlflow.sklearn
+
+        # The raw sklearn estimator accepts CSR input directly:
+        model = mlflow.sklearn.load_model(model_uri)
+
+        try:
+            with open(vectorizer_url, "rb") as file:
+                vectorizer = pickle.load(file)
+        except FileNotFoundError:
+            print(f"{vectorizer_url} file doesn't exist.")
+            raise
+
+        return cls(model, vectorizer, version=model_uri)
+
+    def transform(self, texts: list) -> sparse.csr_matrix:
+        return self.vectorizer.transform(texts)
+
+    def predict(self, texts: list) -> np.ndarray:
+        return self.model.predict(self.transform(texts))
+
+    def predict_proba(self, texts: list) -> np.ndarray:
+        return self.model.predict_proba(self.transform(texts))[:, 1]
+
+    def score(self, texts: list) -> tuple:
+        # Labels and probabilities from a single predict_proba call:
+        proba = self.model.predict_proba(self.transform(texts))
+        labels = self.model.classes_[np.argmax(proba, axis=1)]
+        return labels, proba[:, 1]
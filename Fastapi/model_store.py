@@ -0,0 +1,195 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+
+from Fastapi.model_holder import ModelHolder
+from Fastapi.native_scorer import NativeScorer, export_scoring_artifact
+
+# Where model_evaluation logs the training vectorizer next to the model:
+VECTORIZER_ARTIFACT = "vectorizer/vectorizer.pkl"
+VECTORIZER_TAG = "vectorizer_sha256"
+
+
+def file_sha256(url: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(url, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+class LocalModelStore:
+    """Champion model and vectorizer materialized on local disk.
+
+    Each version lives in <root>/<version>/ next to a manifest.json with the
+    sha256 of every file; <root>/current.json points at the served version.
+    Bag-of-words models also get a scoring/ folder of .npy arrays for
+    NativeScorer.
+    """
+
+    def __init__(self, root: str = os.path.join("models", "store")):
+        self.root = root
+        self.current_url = os.path.join(root, "current.json")
+
+    def exists(self) -> bool:
+        return os.path.exists(self.current_url)
+
+    def current_version(self):
+        if not self.exists():
+            return None
+        with open(self.current_url, "r") as file:
+            return json.load(file)["version"]
+
+    def manifest(self, version: str) -> dict:
+        with open(os.path.join(self.root, str(version), "manifest.json"), "r") as file:
+            return json.load(file)
+
+    def materialize(self, model, vectorizer_url: str, version: str, source: str = None) -> dict:
+        version = str(version)
+        with open(vectorizer_url, "rb") as file:
+            vectorizer = pickle.load(file)
+        check_features(model, vectorizer, version)
+
+        tmp_path = os.path.join(self.root, f".{version}.tmp")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+
+        with open(os.path.join(tmp_path, "model.pkl"), "wb") as file:
+            pickle.dump(model, file)
+        shutil.copyfile(vectorizer_url, os.path.join(tmp_path, "vectorizer.pkl"))
+        files = ["model.pkl", "vectorizer.pkl"]
+
+        try:
+            exported = export_scoring_artifact(model, vectorizer, os.path.join(tmp_path, "scoring"))
+            files.extend(f"scoring/{name}" for name in exported)
+        except ValueError as e:
+            print(f"Skipping native scoring artifact: {e}")
+
+        manifest = {
+            "version": version,
+            "source": source,
+            "created_at": time.time(),
+            "files": {name: file_sha256(os.path.join(tmp_path, name)) for name in files}
+        }
+        with open(os.path.join(tmp_path, "manifest.json"), "w") as file:
+            json.dump(manifest, file, indent=4)
+
+        # Move the finished version in place, then flip the pointer:
+        version_path = os.path.join(self.root, version)
+        shutil.rmtree(version_path, ignore_errors=True)
+        os.replace(tmp_path, version_path)
+        self.set_current(version)
+
+        return manifest
+
+    def set_current(self, version: str) -> None:
+        tmp_url = self.current_url + ".tmp"
+        with open(tmp_url, "w") as file:
+            json.dump({"version": str(version)}, file)
+        os.replace(tmp_url, self.current_url)
+
+    def load(self, version: str = None, native: bool = False, mmap: bool = False):
+        version = version or self.current_version()
+        if version is None:
+            raise FileNotFoundError(f"No model version is materialized in {self.root}, "
+                                    "refresh it from the model registry first.")
+        version = str(version)
+        version_path = os.path.join(self.root, version)
+        manifest = self.manifest(version)
+
+        # Refuse to serve anything that doesn't match its manifest:
+        for name, checksum in manifest["files"].items():
+            if file_sha256(os.path.join(version_path, name)) != checksum:
+                raise ValueError(f"Checksum mismatch for {name} of model version {version}.")
+
+        if native:
+            return NativeScorer.load(os.path.join(version_path, "scoring"), version=version, mmap=mmap)
+
+        with open(os.path.join(version_path, "model.pkl"), "rb") as file:
+            model = pickle.load(file)
+        with open(os.path.join(version_path, "vectorizer.pkl"), "rb") as file:
+            vectorizer = pickle.load(file)
+
+        return ModelHolder(model, vectorizer, version=version)
+
+
+def check_features(model, vectorizer, version: str) -> None:
+    # A vocabulary of another size can't be the one the model was fit on:
+    if hasattr(vectorizer, "vocabulary_"):
+        n_features = len(vectorizer.vocabulary_)
+    else:
+        n_features = getattr(vectorizer, "n_features", None)
+    if n_features is not None and n_features != model.n_features_in_:
+        raise ValueError(f"Model version {version} expects {model.n_features_in_} features, "
+                         f"the vectorizer produces {n_features}.")
+
+
+def fetch_vectorizer(model_version, fallback_url: str, dst_path: str) -> str:
+    import mlflow.artifacts
+    from mlflow.exceptions import MlflowException
+
+    # Versions registered with their vectorizer carry it in the run's artifacts:
+    try:
+        url = mlflow.artifacts.download_artifacts(run_id=model_version.run_id, artifact_path=VECTORIZER_ARTIFACT,
+                                                  dst_path=dst_path)
+    except (MlflowException, OSError) as e:
+        print(f"Model version {model_version.version} has no logged vectorizer, using {fallback_url}.")
+        print(e)
+        url = fallback_url
+
+    expected = (model_version.tags or {}).get(VECTORIZER_TAG)
+    if expected is None:
+        print(f"Model version {model_version.version} has no {VECTORIZER_TAG} tag, "
+              f"can't verify {url} is the vectorizer it was trained with.")
+    elif file_sha256(url) != expected:
+        raise ValueError(f"{url} isn't the vectorizer model version {model_version.version} was trained with.")
+
+    return url
+
+
+def refresh_from_registry(store: LocalModelStore, model_name: str, alias: str,
+                          vectorizer_url: str = os.path.join("models", "vectorizer.pkl")) -> bool:
+    import mlflow.sklearn
+    from mlflow import MlflowClient
+
+    # Only download when the alias points somewhere new:
+    model_version = MlflowClient().get_model_version_by_alias(model_name, alias)
+    version = model_version.version
+    if str(version) == store.current_version():
+        return False
+
+    model_uri = f"models:/{model_name}/{version}"
+    with tempfile.TemporaryDirectory() as tmp:
+        # The model is only served with the vectorizer it was trained with:
+        url = fetch_vectorizer(model_version, vectorizer_url, tmp)
+        model = mlflow.sklearn.load_model(model_uri)
+        store.materialize(model, url, version, source=model_uri)
+    print(f"Materialized {model_uri} into {store.root}")
+
+    return True
+
+
+def connect_registry() -> None:
+    dagshub_token = os.getenv("DAGSHUB_PAT")
+    if not dagshub_token:
+        raise EnvironmentError("DAGSHUB_PAT environment variable is not set.")
+
+    os.environ["MLFLOW_TRACKING_USERNAME"] = dagshub_token
+    os.environ["MLFLOW_TRACKING_PASSWORD"] = dagshub_token
+
+    dagshub_url = "https://dagshub.com"
+    repo_owner = "PriyanshuMewal"
+    repo_name = 'mini-project'
+
+    import mlflow
+    mlflow.set_tracking_uri(f"{dagshub_url}/{repo_owner}/{repo_name}.mlflow")
+
+
+if __name__ == "__main__":
+    # Materialize the champion ahead of time, e.g. while building an image:
+    connect_registry()
+    refresh_from_registry(LocalModelStore(), "emotion_detection", "champion")
@@ -0,0 +1,114 @@
+import threading
+import time
+
+# Synthetic requests every new model answers before it is swapped in:
+WARMUP_TEXTS = [
+    "i am so happy today",
+    "this is the worst day of my life",
+    "missing my friends so much",
+    "love the sunshine this morning",
+]
+
+
+def score_with_holders(items: list) -> tuple:
+    """Scores (holder, text) pairs, each text with the holder it came with.
+
+    A request captures the served holder before it waits in the
+    MicroBatcher; a swap landing meanwhile must not change its model.
+    """
+    labels, probabilities = [None] * len(items), [None] * len(items)
+
+    groups = {}
+    for i, (holder, _) in enumerate(items):
+        groups.setdefault(id(holder), (holder, []))[1].append(i)
+
+    for holder, positions in groups.values():
+        group_labels, group_probabilities = holder.score([items[i][1] for i in positions])
+        for i, label, probability in zip(positions, group_labels, group_probabilities):
+            labels[i], probabilities[i] = label, probability
+
+    return labels, probabilities
+
+
+class ModelWatcher:
+    """Swaps in a new model version without restarting the service.
+
+    Every interval seconds a daemon thread runs refresh_fn (e.g. a pull of
+    the champion from the registry into the store), then compares the
+    store's current version with the served one. A new version is loaded
+    and warmed up on the watcher thread, and only then replaces holder in
+    one attribute assignment; requests keep using the old model until then,
+    and a version that fails to load or warm up is never served.
+    """
+
+    def __init__(self, store, holder, load_fn=None, refresh_fn=None, warmup_texts: list = None,
+                 interval: float = 60):
+        self.store = store
+        self.holder = holder
+        self.load_fn = load_fn if load_fn is not None else store.load
+        self.refresh_fn = refresh_fn
+        self.warmup_texts = warmup_texts if warmup_texts is not None else WARMUP_TEXTS
+        self.interval = interval
+        self.loaded_at = time.time()
+        self.reloads = 0
+        self.last_error = None
+        self.thread = None
+        self.stopped = threading.Event()
+
+    def warmup(self, candidate) -> None:
+        # Score like /predict/batch and /predict would, then check the shapes:
+        labels, probabilities = candidate.score(self.warmup_texts)
+        if len(labels) != len(self.warmup_texts) or len(probabilities) != len(self.warmup_texts):
+            raise ValueError(f"Model version {candidate.version} returned malformed warmup predictions.")
+        for text in self.warmup_texts:
+            candidate.score([text])
+
+    def check(self) -> bool:
+        try:
+            if self.refresh_fn is not None:
+                self.refresh_fn()
+
+            version = self.store.current_version()
+            if version is None or version == self.holder.version:
+                return False
+
+            candidate = self.load_fn(version)
+            self.warmup(candidate)
+        except Exception as e:
+            self.last_error = str(e)
+            print("Model reload failed, still serving the previous version.")
+            print(e)
+            return False
+
+        self.holder = candidate
+        self.loaded_at = time.time()
+        self.reloads += 1
+        self.last_error = None
+        print(f"Now serving model version {candidate.version}")
+
+        return True
+
+    def run(self) -> None:
+        while not self.stopped.is_set():
+            self.check()
+            self.stopped.wait(self.interval)
+
+    def start(self) -> None:
+        if self.thread is None or not self.thread.is_alive():
+            self.stopped.clear()
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def status(self) -> dict:
+        return {
+            "version": self.holder.version,
+            "loaded_at": self.loaded_at,
+            "reloads": self.reloads,
+            "last_error": self.last_error
+        }
@@ -0,0 +1,121 @@
+import json
+import os
+import re
+
+import numpy as np
+
+DEFAULT_TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+ARRAYS = ["vocabulary", "coef", "intercept", "classes"]
+
+
+def sigmoid(x: np.ndarray) -> np.ndarray:
+    # Overflow-free 1 / (1 + exp(-x)):
+    return np.exp(-np.logaddexp(0, -x))
+
+
+def export_scoring_artifact(model, vectorizer, file_path: str) -> list:
+
+    # Only the default word unigram CountVectorizer can be replayed by hand:
+    params = vectorizer.get_params()
+    if (not hasattr(vectorizer, "vocabulary_") or params["analyzer"] != "word"
+            or params["ngram_range"] != (1, 1) or params["tokenizer"] is not None
+            or params["preprocessor"] is not None or params["binary"]
+            or params["strip_accents"] is not None):
+        raise ValueError("Only a default unigram CountVectorizer can be exported for native scoring.")
+    if model.coef_.shape[0] != 1:
+        raise ValueError("Native scoring supports binary linear models only.")
+
+    # Vocabulary sorted for binary search, one .npy per array for mmap:
+    vocabulary = vectorizer.get_feature_names_out().astype(str)
+    order = np.argsort(vocabulary)
+    arrays = {
+        "vocabulary": vocabulary[order],
+        "coef": model.coef_[0][order].astype(np.float64),
+        "intercept": model.intercept_.astype(np.float64),
+        "classes": model.classes_
+    }
+    os.makedirs(file_path, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(file_path, f"{name}.npy"), array)
+
+    with open(os.path.join(file_path, "config.json"), "w") as file:
+        json.dump({"token_pattern": params["token_pattern"], "lowercase": params["lowercase"]}, file)
+
+    return [f"{name}.npy" for name in arrays] + ["config.json"]
+
+
+class NativeScorer:
+    """Logistic regression over token counts with NumPy only.
+
+    Holds the vocabulary, coefficient vector and intercept as plain arrays
+    and mirrors ModelHolder's predict/predict_proba/score interface. With
+    mmap=True the arrays stay in the page cache, shared by every process
+    that maps them, and tokens are found by binary search in the sorted
+    vocabulary instead of a per-process dict.
+    """
+
+    def __init__(self, vocabulary: np.ndarray, coef: np.ndarray, intercept: float,
+                 classes: np.ndarray, token_pattern: str = DEFAULT_TOKEN_PATTERN,
+                 lowercase: bool = True, version: str = None, index: bool = True):
+        self.feature_names = vocabulary
+        self.coef = coef
+        self.intercept = float(intercept)
+        self.classes = classes
+        self.token_pattern = re.compile(token_pattern)
+        self.lowercase = lowercase
+        self.version = version
+        self.index = {term: i for i, term in enumerate(vocabulary.tolist())} if index else None
+
+    @classmethod
+    def load(cls, file_path: str, version: str = None, mmap: bool = False):
+        arrays = {name: np.load(os.path.join(file_path, f"{name}.npy"), mmap_mode="r" if mmap else None)
+                  for name in ARRAYS}
+        with open(os.path.join(file_path, "config.json"), "r") as file:
+            config = json.load(file)
+
+        return cls(arrays["vocabulary"], arrays["coef"], arrays["intercept"][0], np.asarray(arrays["classes"]),
+                   config["token_pattern"], config["lowercase"], version=version, index=not mmap)
+
+    def tokenize(self, texts: list) -> tuple:
+        # Row number and token of every token in the batch:
+        rows = []
+        tokens = []
+        for row, text in enumerate(texts):
+            if self.lowercase:
+                text = text.lower()
+
+            found = self.token_pattern.findall(text)
+            tokens.extend(found)
+            rows.extend([row] * len(found))
+
+        return np.array(rows, dtype=np.int64), tokens
+
+    def lookup(self, tokens: list) -> np.ndarray:
+        # Vocabulary index per token, -1 for unknown tokens:
+        if self.index is not None:
+            index = self.index
+            return np.array([index.get(token, -1) for token in tokens], dtype=np.int64)
+
+        if not tokens:
+            return np.empty(0, dtype=np.int64)
+        tokens = np.array(tokens)
+        positions = np.minimum(np.searchsorted(self.feature_names, tokens), len(self.feature_names) - 1)
+        return np.where(self.feature_names[positions] == tokens, positions, -1)
+
+    def decision_function(self, texts: list) -> np.ndarray:
+        rows, tokens = self.tokenize(texts)
+        indices = self.lookup(tokens)
+        known = indices >= 0
+
+        # Sparse dot product: every known token adds its coefficient to its row:
+        return np.bincount(rows[known], weights=self.coef[indices[known]], minlength=len(texts)) + self.intercept
+
+    def predict(self, texts: list) -> np.ndarray:
+        return self.classes[(self.decision_function(texts) > 0).astype(int)]
+
+    def predict_proba(self, texts: list) -> np.ndarray:
+        return sigmoid(self.decision_function(texts))
+
+    def score(self, texts: list) -> tuple:
+        scores = self.decision_function(texts)
+        return self.classes[(scores > 0).astype(int)], sigmoid(scores)
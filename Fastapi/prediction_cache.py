@@ -0,0 +1,142 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+class CacheBackend(ABC):
+    """Storage interface for PredictionCache.
+
+    Implement get/set/clear (e.g. on top of a shared key-value store) to share
+    predictions between workers; LocalBackend keeps them in process.
+    """
+
+    def __init__(self):
+        self.evictions = 0
+
+    @abstractmethod
+    def get(self, key: str):
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: tuple) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+
+class LocalBackend(CacheBackend):
+    """Thread-safe in-process LRU with a per-entry time to live."""
+
+    def __init__(self, max_size: int = 100000, ttl: float = 3600):
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                self.evictions += 1
+                return None
+
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: tuple) -> None:
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + self.ttl)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class PredictionCache:
+    """(label, probability) per normalized text, scoped to a model version.
+
+    Keys carry the model version, so swapping models never serves a stale
+    prediction; the old entries age out through the backend's LRU and TTL.
+    Only the current version is stored: requests that finish on a model that
+    was swapped out meanwhile neither write nor move the version back. The
+    current version is read from current_version() when given (e.g. the
+    served model, so a rollback counts as a swap), otherwise it is the
+    newest version seen.
+    """
+
+    def __init__(self, backend: CacheBackend = None, current_version=None):
+        self.backend = backend if backend is not None else LocalBackend()
+        self.current_version = current_version
+        self.version = None
+        self.retired = set()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def check_version(self, version: str) -> bool:
+        """Track the current version, return whether `version` is current."""
+        with self.lock:
+            if self.current_version is not None:
+                current = self.current_version()
+            elif version in self.retired:
+                return False
+            else:
+                current = version
+
+            if current != self.version:
+                if self.version is not None:
+                    self.retired.add(self.version)
+                    self.invalidations += 1
+                self.retired.discard(current)
+                self.version = current
+
+            return version == self.version
+
+    @staticmethod
+    def key(text: str, version: str) -> str:
+        return f"{version}:{text}"
+
+    def get(self, text: str, version: str):
+        self.check_version(version)
+
+        value = self.backend.get(self.key(text, version))
+        with self.lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, text: str, value: tuple, version: str) -> None:
+        if self.check_version(version):
+            self.backend.set(self.key(text, version), value)
+
+    def stats(self) -> dict:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.backend.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "version": self.version
+            }
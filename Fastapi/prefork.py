@@ -0,0 +1,155 @@
+import argparse
+import gc
+import multiprocessing
+import os
+import signal
+import socket
+import time
+
+import psutil
+
+
+def process_memory(pid: int = None) -> dict:
+    # rss counts shared pages in full, pss splits them between the sharers
+    # and uss is what the process alone would give back on exit:
+    info = psutil.Process(pid).memory_full_info()
+    return {
+        "pid": pid or os.getpid(),
+        "rss_mb": info.rss / 2**20,
+        "pss_mb": info.pss / 2**20,
+        "uss_mb": info.uss / 2**20,
+        "shared_mb": info.shared / 2**20
+    }
+
+
+def report_memory(pids: list) -> None:
+    print(f"{'pid':>8}{'rss MB':>10}{'pss MB':>10}{'uss MB':>10}")
+    total = 0.0
+    for pid in [os.getpid()] + pids:
+        try:
+            memory = process_memory(pid)
+        except psutil.NoSuchProcess:
+            continue
+        total += memory["pss_mb"]
+        print(f"{pid:>8}{memory['rss_mb']:>10.1f}{memory['pss_mb']:>10.1f}{memory['uss_mb']:>10.1f}")
+    print(f"{'total pss':>18}{total:>10.1f}")
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def fork_worker(app, sock: socket.socket, log_level: str) -> int:
+    pid = os.fork()
+    if pid:
+        return pid
+
+    # Worker: serve the app inherited from the parent on the shared socket:
+    import uvicorn
+
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    uvicorn.Server(uvicorn.Config(app, log_level=log_level)).run(sockets=[sock])
+    os._exit(0)
+
+
+def refresh_store() -> None:
+    from Fastapi.model_store import LocalModelStore, connect_registry, refresh_from_registry
+
+    try:
+        connect_registry()
+        refresh_from_registry(LocalModelStore(os.getenv("MODEL_STORE_DIR", os.path.join("models", "store"))),
+                              "emotion_detection", "champion")
+    except Exception as e:
+        print("Refresh from the model registry failed, serving the local store.")
+        print(e)
+
+
+def refresh_in_background(process: multiprocessing.Process = None, target=None) -> multiprocessing.Process:
+    # A registry download can take a while and the waitpid loop must keep
+    # restarting workers meanwhile. It runs in a spawned process, a thread
+    # could hold a lock (logging, urllib3, imports) when a worker is forked;
+    # at most one refresh runs at a time:
+    if process is not None and process.is_alive():
+        return process
+    process = multiprocessing.get_context("spawn").Process(target=target or refresh_store, daemon=True)
+    process.start()
+    return process
+
+
+def serve(host: str = "0.0.0.0", port: int = 8000, workers: int = 2, report_interval: float = 0,
+          log_level: str = "info") -> None:
+
+    # Only the parent talks to the registry, threads don't survive fork and
+    # the workers' watchers pick new versions up from the local store:
+    registry = os.getenv("MODEL_STORE_OFFLINE", "0") != "1"
+    poll_interval = float(os.getenv("MODEL_POLL_INTERVAL", "60"))
+    if registry:
+        refresh_store()
+    os.environ["MODEL_STORE_OFFLINE"] = "1"
+
+    # Load model, vectorizer and WordNet once, workers share them copy-on-write:
+    from Fastapi import main as service
+
+    # Keep the collector from writing to every inherited object header:
+    gc.collect()
+    gc.freeze()
+
+    sock = bind_socket(host, port)
+    pids = [fork_worker(service.app, sock, log_level) for _ in range(workers)]
+    print(f"Serving {service.watcher.holder.version} on {host}:{port} with workers {pids}")
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in pids:
+            os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    refresher = None
+    last_report = last_refresh = time.monotonic()
+    while pids:
+        # Wait on the workers only, the refresher is reaped by multiprocessing:
+        exited = False
+        for pid in list(pids):
+            done, status = os.waitpid(pid, os.WNOHANG)
+            if done:
+                exited = True
+                pids.remove(pid)
+                if not stopping:
+                    print(f"Worker {pid} exited with status {status}, restarting it.")
+                    pids.append(fork_worker(service.app, sock, log_level))
+        if exited:
+            continue
+
+        if report_interval and time.monotonic() - last_report >= report_interval:
+            report_memory(pids)
+            last_report = time.monotonic()
+        if registry and poll_interval and time.monotonic() - last_refresh >= poll_interval:
+            refresher = refresh_in_background(refresher)
+            last_refresh = time.monotonic()
+        time.sleep(0.2)
+
+    sock.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-fork launcher for the FastAPI service.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)))
+    parser.add_argument("--report-interval", type=float, default=float(os.getenv("MEMORY_REPORT_INTERVAL", "60")),
+                        help="Seconds between per-worker memory reports, 0 disables them.")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.workers, args.report_interval, args.log_level)
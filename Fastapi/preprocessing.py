@@ -1,14 +1,11 @@
-import nltk
-from nltk.corpus import stopwords, wordnet
-from nltk.stem import WordNetLemmatizer
-import pandas as pd
-import numpy as np
 import re
 
-nltk.download('stopwords')
-nltk.download('wordnet')
+from src.data.nltk_resources import ensure_corpora
+from src.data.text_normalizer import get_normalizer
 
 def lemmatization(text: str) -> str:
+    ensure_corpora()
+    from nltk.stem import WordNetLemmatizer
     lemmatizer = WordNetLemmatizer()
 
     text = text.split()
@@ -17,6 +14,8 @@ def lemmatization(text: str) -> str:
     return " ".join(text)
 
 def remove_stop_words(text: str) -> str:
+    ensure_corpora()
+    from nltk.corpus import stopwords
     try:
         stop_words = set(stopwords.words("english"))
     except Exception:
@@ -51,11 +50,15 @@ def removing_urls(text: str) -> str:
     url_pattern = re.compile(r"https?://\S+|www\.\S+")
     return url_pattern.sub(r"", text)
 
+def warm_lemma_cache(feature_names) -> int:
+    # Pin every vectorizer feature so known words never reach WordNet:
+    if feature_names is None:
+        return 0
+    return get_normalizer().lemma_cache.warm(feature_names)
+
+def lemma_cache_stats() -> dict:
+    return get_normalizer().lemma_cache.stats()
+
 def normalize_text(content: str) -> str:
-    content = lower_case(content)
-    content = remove_stop_words(content)
-    content = removing_numbers(content)
-    content = removing_punctuations(content)
-    content = removing_urls(content)
-    content = lemmatization(content)
-    return content
\ No newline at end of file
+    # Same steps as above, shared with the training pipeline:
+    return get_normalizer().normalize(content)
\ No newline at end of file
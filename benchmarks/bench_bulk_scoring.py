@@ -0,0 +1,97 @@
+import json
+import os
+import pickle
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+from Fastapi.model_store import LocalModelStore
+
+PORT = 8766
+WORDS = ["happy", "sad", "day", "love", "miss", "work", "tired", "great", "friends", "home",
+         "today", "tomorrow", "sleep", "headache", "sunshine", "rain", "party", "movie", "music"]
+
+# Runs the CLI and reports its peak resident memory:
+CLI = """
+import resource, sys
+from Fastapi import bulk_scoring
+sys.argv = ["bulk_scoring"] + sys.argv[1:]
+bulk_scoring.main()
+print(f"maxrss_mb {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f}", file=sys.stderr)
+"""
+
+def build_store(root: str) -> str:
+    # Any model with the right number of features will do for throughput:
+    vectorizer_url = os.path.join("models", "vectorizer.pkl")
+    with open(vectorizer_url, "rb") as file:
+        vectorizer = pickle.load(file)
+
+    rng = np.random.default_rng(42)
+    x = rng.poisson(0.05, size=(2000, len(vectorizer.vocabulary_)))
+    model = LogisticRegression(C=0.1, max_iter=150).fit(x, rng.integers(0, 2, size=2000))
+
+    store_path = os.path.join(root, "store")
+    LocalModelStore(store_path).materialize(model, vectorizer_url, "1")
+    return store_path
+
+def write_input(url: str, n_rows: int) -> None:
+    random.seed(42)
+    words = WORDS + [f"word{i}" for i in range(2000)]
+    with open(url, "w") as file:
+        for i in range(n_rows):
+            text = " ".join(random.choices(words, k=random.randint(4, 20)))
+            file.write(json.dumps({"id": i, "text": text}) + "\n")
+
+def run_cli(input_url: str, store_path: str) -> dict:
+    stderr = subprocess.run([sys.executable, "-c", CLI, input_url, "-o", os.devnull, "--store", store_path,
+                             "--report-every", "0"],
+                            capture_output=True, text=True, check=True, env=dict(os.environ, PYTHONPATH=os.getcwd())).stderr
+    lines = stderr.strip().splitlines()
+    return {"summary": lines[-2], "maxrss_mb": lines[-1].split()[-1]}
+
+def run_endpoint(input_url: str, store_path: str) -> str:
+    env = dict(os.environ, MODEL_STORE_DIR=store_path, MODEL_STORE_OFFLINE="1", MEMORY_REPORT_INTERVAL="0",
+               MODEL_POLL_INTERVAL="0", PYTHONPATH=os.getcwd())
+    server = subprocess.Popen([sys.executable, "-m", "Fastapi.prefork", "--port", str(PORT), "--workers", "1",
+                               "--log-level", "warning"], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(240):
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{PORT}/version", timeout=1)
+                break
+            except OSError:
+                time.sleep(0.5)
+
+        # Chunked upload, the response is consumed while it streams back:
+        with open(input_url, "rb") as file:
+            request = urllib.request.Request(f"http://127.0.0.1:{PORT}/predict/stream", data=iter(file),
+                                             headers={"Content-Type": "application/x-ndjson"})
+            start = time.perf_counter()
+            n_rows = sum(1 for _ in urllib.request.urlopen(request))
+            seconds = time.perf_counter() - start
+        return f"{n_rows} rows in {seconds:.1f}s ({n_rows / seconds:.0f} rows/s)"
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or [100000, 1000000]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store_path = build_store(tmp)
+        for n_rows in sizes:
+            input_url = os.path.join(tmp, f"input_{n_rows}.ndjson")
+            write_input(input_url, n_rows)
+
+            cli = run_cli(input_url, store_path)
+            print(f"CLI      {n_rows:>9} rows: {cli['summary']}, peak rss {cli['maxrss_mb']} MB")
+            print(f"endpoint {n_rows:>9} rows: {run_endpoint(input_url, store_path)}")
+
+if __name__ == "__main__":
+    main()
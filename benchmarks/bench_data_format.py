@@ -0,0 +1,85 @@
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+import yaml
+
+from src.data import data_preprocessing
+from src.data.data_io import write_frame
+from src.features import feature_engineering
+from src.model import model_building
+
+WORDS = ["happy", "sad", "day", "love", "miss", "work", "tired", "great", "friends",
+         "home", "today", "tomorrow", "sleep", "headache", "sunshine", "rain", "party",
+         "movie", "music", "school", "weekend", "morning", "night", "best", "worst"]
+
+def synthetic_tweets(n_rows: int) -> pd.DataFrame:
+    random.seed(42)
+    words = WORDS + [f"word{i}" for i in range(2000)]
+    content = [" ".join(random.choices(words, k=random.randint(4, 20))) for _ in range(n_rows)]
+    sentiment = [random.randint(0, 1) for _ in range(n_rows)]
+    return pd.DataFrame({"sentiment": sentiment, "content": content})
+
+def folder_size(file_path: str) -> int:
+    size = 0
+    for root, _, files in os.walk(file_path):
+        size += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return size
+
+def run_pipeline(fmt: str, df: pd.DataFrame, params: dict) -> dict:
+    cwd = os.getcwd()
+    work_dir = tempfile.mkdtemp()
+
+    try:
+        os.chdir(work_dir)
+        params = dict(params, storage={"format": fmt})
+        with open("params.yaml", "w") as file:
+            yaml.safe_dump(params, file)
+
+        os.makedirs(os.path.join("data", "raw"))
+        os.makedirs("models")
+        split = int(len(df) * 0.6)
+        write_frame(df.iloc[:split], os.path.join("data", "raw"), "train", fmt)
+        write_frame(df.iloc[split:], os.path.join("data", "raw"), "test", fmt)
+
+        timings = {}
+        for name, stage in [("data_preprocessing", data_preprocessing.main),
+                            ("feature_engineering", feature_engineering.main),
+                            ("model_building", model_building.main)]:
+            start = time.perf_counter()
+            stage()
+            timings[name] = time.perf_counter() - start
+
+        timings["total"] = sum(timings.values())
+        timings["disk_mb"] = folder_size("data") / 2 ** 20
+        return timings
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir)
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    with open("params.yaml", "r") as file:
+        params = yaml.safe_load(file)
+    params["data_preprocessing"]["n_jobs"] = 1
+
+    df = synthetic_tweets(n_rows)
+
+    # Load WordNet up front so the first run isn't charged for it:
+    data_preprocessing.get_normalizer().normalize("warming up")
+
+    results = {fmt: run_pipeline(fmt, df, params) for fmt in ["csv", "parquet"]}
+
+    print(f"rows: {n_rows}, max_features: {params['feature_engineering']['max_features']}")
+    print(f"{'':22}{'csv':>10}{'parquet':>10}")
+    for key in results["csv"]:
+        unit = "MB" if key == "disk_mb" else "s"
+        print(f"{key:22}{results['csv'][key]:>9.2f}{unit[0]}{results['parquet'][key]:>9.2f}{unit[0]}")
+
+if __name__ == "__main__":
+    main()
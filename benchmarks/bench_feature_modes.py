@@ -0,0 +1,78 @@
+import os
+import pickle
+import random
+import time
+
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+
+from src.features.feature_engineering import build_vectorizer
+
+POSITIVE = ["happy", "love", "great", "fun", "awesome", "best", "smile", "thanks"]
+NEGATIVE = ["sad", "miss", "tired", "sick", "hate", "worst", "cry", "alone"]
+
+def synthetic_tweets(n_rows: int) -> pd.DataFrame:
+    random.seed(42)
+    filler = [f"word{chr(97 + i % 26)}{chr(97 + i // 26 % 26)}" for i in range(5000)]
+
+    rows = []
+    for _ in range(n_rows):
+        sentiment = random.randint(0, 1)
+        words = random.choices(filler, k=random.randint(4, 15))
+        words += random.choices(POSITIVE if sentiment else NEGATIVE, k=random.randint(0, 2))
+        words += random.choices(NEGATIVE if sentiment else POSITIVE, k=random.randint(0, 1))
+        rows.append((sentiment, " ".join(words)))
+
+    return pd.DataFrame(rows, columns=["sentiment", "content"])
+
+def load_data() -> tuple:
+
+    # Prefer the normalized tweets when the pipeline has already run:
+    train_url = os.path.join("data", "interim", "train.csv")
+    test_url = os.path.join("data", "interim", "test.csv")
+    if os.path.exists(train_url):
+        train_data = pd.read_csv(train_url).dropna()
+        test_data = pd.read_csv(test_url).dropna()
+        return train_data, test_data
+
+    df = synthetic_tweets(60000)
+    split = int(len(df) * 0.6)
+    return df.iloc[:split], df.iloc[split:]
+
+def evaluate(params: dict, train_data: pd.DataFrame, test_data: pd.DataFrame) -> dict:
+    vectorizer = build_vectorizer(params)
+
+    start = time.perf_counter()
+    x_train = vectorizer.fit_transform(train_data["content"].values)
+    x_test = vectorizer.transform(test_data["content"].values)
+    elapsed = time.perf_counter() - start
+
+    model = LogisticRegression(C=0.1, max_iter=150)
+    model.fit(x_train, train_data["sentiment"].values)
+    accuracy = accuracy_score(test_data["sentiment"].values, model.predict(x_test))
+
+    return {
+        "docs_per_s": (len(train_data) + len(test_data)) / elapsed,
+        "accuracy": accuracy,
+        "artifact_kb": len(pickle.dumps(vectorizer)) / 1024
+    }
+
+def main():
+    train_data, test_data = load_data()
+
+    configs = {
+        "bow (max_features=300)": {"mode": "bow", "max_features": 300},
+        "hashing (2**18)": {"mode": "hashing", "n_features": 2 ** 18},
+        "hashing + tfidf (2**18)": {"mode": "hashing", "n_features": 2 ** 18, "tfidf": True},
+        "hashing (2**10)": {"mode": "hashing", "n_features": 2 ** 10},
+    }
+
+    print(f"train rows: {len(train_data)}, test rows: {len(test_data)}")
+    print(f"{'':26}{'docs/s':>12}{'accuracy':>10}{'pickle KB':>12}")
+    for name, params in configs.items():
+        result = evaluate(params, train_data, test_data)
+        print(f"{name:26}{result['docs_per_s']:>12.0f}{result['accuracy']:>10.3f}{result['artifact_kb']:>12.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_training import synthetic_bow
+from src.data.data_io import read_matrix, write_matrix, write_vocabulary
+from src.model.model_building import incremental_building, model_building
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    n_features = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    n_new = n_rows // 20
+
+    x, y = synthetic_bow(n_rows, n_features)
+    test_x, test_y = x[-n_new:], y[-n_new:]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        params = {"c": 0.1, "max_iter": 150, "solver": "newton-cg", "n_jobs": -1,
+                  "incremental": {"batch_size": 10000, "epochs": 5, "alpha": 1e-6,
+                                  "checkpoint": os.path.join(tmp, "checkpoint.pkl")}}
+
+        # History first, then 5% new rows appended to it, same vocabulary:
+        write_vocabulary([f"w{i}" for i in range(n_features)], tmp)
+        write_matrix(x[:n_rows - n_new], y[:n_rows - n_new], tmp, "train_bow")
+        _, first = incremental_building(tmp, "train_bow", params)
+        write_matrix(x, y, tmp, "train_bow")
+        params["incremental"]["resume"] = True
+        model, resumed = incremental_building(tmp, "train_bow", params, append_only=True)
+        del x, y
+
+        print(f"{n_rows} rows x {n_features} features, last {n_new} rows are new")
+        print(f"incremental, history      {first['rows_trained']:>8} rows {first['fit_time']:>7.2f}s")
+        print(f"incremental, resume       {resumed['rows_trained']:>8} rows {resumed['fit_time']:>7.2f}s"
+              f"  accuracy on new rows {model.score(test_x, test_y):.4f}")
+
+        start = time.perf_counter()
+        full_x, full_y = read_matrix(tmp, "train_bow")
+        lr, full = model_building(full_x, full_y, params)
+        print(f"batch newton-cg, full     {full['n_samples']:>8} rows {time.perf_counter() - start:>7.2f}s"
+              f"  accuracy on new rows {lr.score(test_x, test_y):.4f}")
+
+    print(f"peak rss {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+if __name__ == "__main__":
+    main()
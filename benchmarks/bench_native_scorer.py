@@ -0,0 +1,76 @@
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+import mlflow.pyfunc
+import mlflow.sklearn
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+from Fastapi.model_holder import ModelHolder
+from Fastapi.native_scorer import NativeScorer, export_scoring_artifact
+
+TEXTS = [
+    "layin bed headache ughhhh waitin call",
+    "funeral ceremony gloomy friday",
+    "want hang friend soon",
+    "happy today best day life",
+]
+
+def train_model(vectorizer) -> LogisticRegression:
+    # Any model with the right number of features will do for timing:
+    rng = np.random.default_rng(42)
+    n_features = len(vectorizer.vocabulary_)
+    x = rng.poisson(0.05, size=(2000, n_features))
+    y = rng.integers(0, 2, size=2000)
+    return LogisticRegression(C=0.1, max_iter=150).fit(x, y)
+
+def pyfunc_predict(model, vectorizer, texts: list) -> np.ndarray:
+    features = pd.DataFrame(vectorizer.transform(texts).toarray(), columns=vectorizer.get_feature_names_out())
+    return model.predict(features)
+
+def measure(func, texts: list, n_calls: int) -> float:
+    func(texts)
+
+    start = time.perf_counter()
+    for _ in range(n_calls):
+        func(texts)
+    return (time.perf_counter() - start) / n_calls * 1e3
+
+def main():
+    n_calls = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    vectorizer_url = os.path.join("models", "vectorizer.pkl")
+
+    with open(vectorizer_url, "rb") as file:
+        vectorizer = pickle.load(file)
+    model = train_model(vectorizer)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_uri = os.path.join(tmp, "model")
+        mlflow.sklearn.save_model(model, model_uri)
+        pyfunc_model = mlflow.pyfunc.load_model(model_uri)
+
+        holder = ModelHolder.load(model_uri, vectorizer_url)
+        export_scoring_artifact(model, vectorizer, os.path.join(tmp, "scoring"))
+        scorer = NativeScorer.load(os.path.join(tmp, "scoring"))
+
+    batch = TEXTS * 64
+    np.testing.assert_allclose(scorer.predict_proba(batch), holder.predict_proba(batch))
+    np.testing.assert_array_equal(scorer.predict(batch), pyfunc_predict(pyfunc_model, vectorizer, batch))
+
+    paths = {
+        "pyfunc (dense named frame)": lambda texts: pyfunc_predict(pyfunc_model, vectorizer, texts),
+        "ModelHolder (sklearn, CSR)": holder.score,
+        "NativeScorer (NumPy only)": scorer.score,
+    }
+
+    print(f"calls: {n_calls}, features: {len(vectorizer.vocabulary_)}, outputs match")
+    print(f"{'':30}{'1 text ms':>12}{'256 texts ms':>14}")
+    for name, func in paths.items():
+        print(f"{name:30}{measure(func, TEXTS[:1], n_calls):>12.3f}{measure(func, batch, n_calls // 10):>14.3f}")
+
+if __name__ == "__main__":
+    main()
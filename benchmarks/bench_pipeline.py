@@ -0,0 +1,50 @@
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from src.pipeline import clean_outputs
+
+STAGES = ["src.data.data_ingestion", "src.data.data_preprocessing", "src.features.feature_engineering",
+          "src.model.model_building"]
+
+# Run from a directory with params.yaml; every mode rewrites data/, models/
+# and reports/ there. MLflow logging is left out of all three.
+
+def run(commands: list, env: dict) -> float:
+    start = time.perf_counter()
+    for command in commands:
+        subprocess.run(command, env=env, stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+def staged(env: dict) -> float:
+    # The processes dvc repro spawns, without dvc's own hashing and locking:
+    clean_outputs()
+    return run([[sys.executable, "-m", stage] for stage in STAGES], env)
+
+def fused(env: dict) -> float:
+    return run([[sys.executable, "-m", "src.pipeline", "--no-tracking"]], env)
+
+def dvc_repro(env: dict) -> float:
+    return run([["dvc", "repro", "--force", "model_building"]], env)
+
+def main():
+    n_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+               PYTHONWARNINGS="ignore")
+
+    modes = {"dvc repro": dvc_repro, "process per stage": staged, "fused (src.pipeline)": fused}
+    if shutil.which("dvc") is None:
+        print("dvc isn't installed, skipping dvc repro")
+        del modes["dvc repro"]
+
+    print(f"wall time, median of {n_runs}")
+    for name, mode in modes.items():
+        seconds = np.median([mode(env) for _ in range(n_runs)])
+        print(f"{name:24}{seconds:>8.2f}s")
+
+if __name__ == "__main__":
+    main()
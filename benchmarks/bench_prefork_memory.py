@@ -0,0 +1,83 @@
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import numpy as np
+import psutil
+from sklearn.linear_model import LogisticRegression
+
+from Fastapi.model_store import LocalModelStore
+from Fastapi.prefork import process_memory
+
+PORT = 8765
+TEXTS = b'{"texts": ["happy day with friends", "sad rainy monday", "love the sunshine"]}'
+
+def build_store(root: str) -> None:
+    # Any model with the right number of features will do for memory:
+    vectorizer_url = os.path.join("models", "vectorizer.pkl")
+    with open(vectorizer_url, "rb") as file:
+        vectorizer = pickle.load(file)
+
+    rng = np.random.default_rng(42)
+    x = rng.poisson(0.05, size=(2000, len(vectorizer.vocabulary_)))
+    model = LogisticRegression(C=0.1, max_iter=150).fit(x, rng.integers(0, 2, size=2000))
+    LocalModelStore(os.path.join(root, "store")).materialize(model, vectorizer_url, "1")
+
+def wait_ready(timeout: float = 120) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{PORT}/cache/stats", timeout=1)
+            return
+        except OSError:
+            time.sleep(0.5)
+    raise TimeoutError("Service did not come up.")
+
+def measure(cmd: list, env: dict, n_requests: int = 200) -> list:
+    process = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_ready()
+        for _ in range(n_requests):
+            request = urllib.request.Request(f"http://127.0.0.1:{PORT}/predict/batch", data=TEXTS,
+                                             headers={"Content-Type": "application/json"})
+            urllib.request.urlopen(request).read()
+        time.sleep(1)
+
+        parent = psutil.Process(process.pid)
+        return [process_memory(p.pid) for p in [parent] + parent.children(recursive=True)]
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build_store(tmp)
+        env = dict(os.environ, MODEL_STORE_DIR=os.path.join(tmp, "store"), MODEL_STORE_OFFLINE="1",
+                   MEMORY_REPORT_INTERVAL="0", PYTHONPATH=os.getcwd())
+
+        launchers = {
+            "uvicorn --workers (spawn)": [sys.executable, "-m", "uvicorn", "Fastapi.main:app", "--port", str(PORT),
+                                          "--workers", str(workers), "--log-level", "warning"],
+            "Fastapi.prefork": [sys.executable, "-m", "Fastapi.prefork", "--port", str(PORT),
+                                "--workers", str(workers), "--log-level", "warning"],
+            "Fastapi.prefork, native mmap": [sys.executable, "-m", "Fastapi.prefork", "--port", str(PORT),
+                                             "--workers", str(workers), "--log-level", "warning"],
+        }
+
+        print(f"workers: {workers}, memory of every process in the tree, MB")
+        print(f"{'':32}{'processes':>10}{'total rss':>11}{'total pss':>11}{'pss/worker':>12}")
+        for name, cmd in launchers.items():
+            run_env = dict(env, SCORER="native", NATIVE_MMAP="1") if "mmap" in name else env
+            memory = measure(cmd, run_env)
+            rss = sum(m["rss_mb"] for m in memory)
+            pss = sum(m["pss_mb"] for m in memory)
+            print(f"{name:32}{len(memory):>10}{rss:>11.0f}{pss:>11.0f}{pss / workers:>12.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+import mlflow.pyfunc
+import mlflow.sklearn
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+from Fastapi.model_holder import ModelHolder
+from Fastapi.preprocessing import normalize_text
+
+TEXTS = [
+    "Layin n bed with a headache  ughhhh...waitin on your call...",
+    "Funeral ceremony...gloomy friday...",
+    "wants to hang out with friends SOON!",
+    "I'm so happy today, it's the best day of my life!!!",
+]
+
+def train_model(vectorizer) -> LogisticRegression:
+    # Any model with the right number of features will do for timing:
+    rng = np.random.default_rng(42)
+    n_features = len(vectorizer.vocabulary_)
+    x = rng.poisson(0.05, size=(2000, n_features))
+    y = rng.integers(0, 2, size=2000)
+    return LogisticRegression(C=0.1, max_iter=150).fit(x, y)
+
+def percentiles(latencies: list) -> dict:
+    latencies = np.array(latencies) * 1e3
+    return {"mean": latencies.mean(), "p50": np.percentile(latencies, 50),
+            "p99": np.percentile(latencies, 99)}
+
+def before(model, vectorizer_url: str, text: str) -> int:
+    # Old /predict: unpickle per request and score a dense named frame:
+    text = normalize_text(text)
+    with open(vectorizer_url, "rb") as vector:
+        vectorizer = pickle.load(vector)
+
+    text_trf = vectorizer.transform([text])
+    text_trf = pd.DataFrame(text_trf.toarray(), columns=vectorizer.get_feature_names_out())
+    return int(model.predict(text_trf)[0])
+
+def after(holder: ModelHolder, text: str) -> int:
+    text = normalize_text(text)
+    return int(holder.predict([text])[0])
+
+def measure(func, n_requests: int) -> dict:
+    func(TEXTS[0])
+
+    latencies = []
+    for i in range(n_requests):
+        start = time.perf_counter()
+        func(TEXTS[i % len(TEXTS)])
+        latencies.append(time.perf_counter() - start)
+
+    return percentiles(latencies)
+
+def main():
+    n_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    vectorizer_url = os.path.join("models", "vectorizer.pkl")
+
+    with open(vectorizer_url, "rb") as file:
+        vectorizer = pickle.load(file)
+    model = train_model(vectorizer)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_uri = os.path.join(tmp, "model")
+        x_sample = pd.DataFrame(np.zeros((1, len(vectorizer.vocabulary_)), dtype=np.int64),
+                                columns=vectorizer.get_feature_names_out())
+        signature = mlflow.models.infer_signature(x_sample, model.predict(x_sample.values))
+        mlflow.sklearn.save_model(model, model_uri, signature=signature)
+
+        pyfunc_model = mlflow.pyfunc.load_model(model_uri)
+        holder = ModelHolder.load(model_uri, vectorizer_url)
+
+        results = {
+            "before (per-request unpickle + pyfunc)": measure(
+                lambda text: before(pyfunc_model, vectorizer_url, text), n_requests),
+            "after (ModelHolder, sparse row)": measure(
+                lambda text: after(holder, text), n_requests),
+        }
+
+    print(f"requests: {n_requests}, features: {len(vectorizer.vocabulary_)}")
+    print(f"{'':42}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, stats in results.items():
+        print(f"{name:42}{stats['mean']:>10.2f}{stats['p50']:>10.2f}{stats['p99']:>10.2f}")
+
+if __name__ == "__main__":
+    main()
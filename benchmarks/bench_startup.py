@@ -0,0 +1,82 @@
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from Fastapi.model_store import LocalModelStore
+
+TEXTS = ["happy day with friends", "sad rainy monday", "love the sunshine", "miss you so much"]
+
+# (import statement, first unit of work) per entry point:
+ENTRY_POINTS = {
+    "service (Fastapi.main)": (
+        "from Fastapi import main",
+        "from fastapi.testclient import TestClient\n"
+        f"TestClient(main.app).post('/predict/batch', json={{'texts': {TEXTS!r}}})"
+    ),
+    "data_preprocessing": (
+        "from src.data import data_preprocessing",
+        "import pandas as pd\n"
+        f"data_preprocessing.normalize_text(pd.DataFrame({{'content': {TEXTS!r}}}))"
+    ),
+    "feature_engineering": (
+        "from src.features import feature_engineering",
+        "feature_engineering.build_vectorizer({'mode': 'bow', 'max_features': 300, 'tfidf': False})"
+        f".fit_transform({TEXTS!r})"
+    ),
+    "model_building": (
+        "from src.model import model_building",
+        "import numpy as np\n"
+        "from sklearn.linear_model import LogisticRegression\n"
+        "LogisticRegression().fit(np.eye(4), [0, 1, 0, 1])"
+    ),
+}
+
+CHILD = """
+import json, time
+start = time.perf_counter()
+{import_}
+imported = time.perf_counter()
+{first}
+done = time.perf_counter()
+print(json.dumps({{"import": imported - start, "first": done - imported}}))
+"""
+
+def build_store(root: str) -> None:
+    vectorizer = CountVectorizer().fit(TEXTS)
+    model = LogisticRegression().fit(vectorizer.transform(TEXTS), [1, 0, 1, 0])
+
+    vectorizer_url = os.path.join(root, "vectorizer.pkl")
+    with open(vectorizer_url, "wb") as file:
+        pickle.dump(vectorizer, file)
+    LocalModelStore(os.path.join(root, "store")).materialize(model, vectorizer_url, "1")
+
+def run(import_: str, first: str, env: dict) -> dict:
+    output = subprocess.run([sys.executable, "-c", CHILD.format(import_=import_, first=first)],
+                            env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    n_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build_store(tmp)
+        env = dict(os.environ, MODEL_STORE_DIR=os.path.join(tmp, "store"), MODEL_STORE_OFFLINE="1",
+                   PYTHONPATH=os.getcwd())
+
+        print(f"fresh interpreter per run, median of {n_runs}")
+        print(f"{'':26}{'import ms':>12}{'first call ms':>16}")
+        for name, (import_, first) in ENTRY_POINTS.items():
+            runs = [run(import_, first, env) for _ in range(n_runs)]
+            import_ms = np.median([r["import"] for r in runs]) * 1e3
+            first_ms = np.median([r["first"] for r in runs]) * 1e3
+            print(f"{name:26}{import_ms:>12.0f}{first_ms:>16.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import os
+import random
+import time
+
+import pandas as pd
+
+from src.data import data_preprocessing
+from src.data.text_normalizer import TextNormalizer
+
+SAMPLES = [
+    "Layin n bed with a headache  ughhhh...waitin on your call...",
+    "@tiffanylue i know  i was listenin to bad habit earlier",
+    "Funeral ceremony...gloomy friday...",
+    "wants to hang out with friends SOON! http://bit.ly/abc123",
+    "I'm so happy today, 2day is the best day of my life!!!",
+    "cats and dogs are running around the gardens with their owners",
+]
+
+def load_documents(n_docs: int) -> list:
+
+    # Prefer real tweets when the pipeline has already run:
+    url = os.path.join("data", "raw", "train.csv")
+    if os.path.exists(url):
+        docs = pd.read_csv(url)["content"].astype(str).tolist()
+    else:
+        docs = SAMPLES
+
+    random.seed(42)
+    return [random.choice(docs) for _ in range(n_docs)]
+
+def legacy_normalize(content: str) -> str:
+    content = data_preprocessing.lower_case(content)
+    content = data_preprocessing.remove_stop_words(content)
+    content = data_preprocessing.removing_numbers(content)
+    content = data_preprocessing.removing_punctuations(content)
+    content = data_preprocessing.removing_urls(content)
+    content = data_preprocessing.lemmatization(content)
+    return content
+
+def per_document_latency(func, docs: list) -> float:
+
+    # Warm up (WordNet is loaded lazily on the first lemmatize call):
+    func(docs[0])
+
+    start = time.perf_counter()
+    for doc in docs:
+        func(doc)
+    elapsed = time.perf_counter() - start
+
+    return elapsed / len(docs) * 1e6
+
+def main():
+
+    docs = load_documents(20000)
+
+    normalizer = TextNormalizer()
+    assert [normalizer.normalize(d) for d in docs] == [legacy_normalize(d) for d in docs]
+
+    legacy = per_document_latency(legacy_normalize, docs)
+    single_pass = per_document_latency(normalizer.normalize, docs)
+
+    print(f"documents:           {len(docs)}")
+    print(f"six-pass pipeline:   {legacy:8.2f} us/doc")
+    print(f"single-pass engine:  {single_pass:8.2f} us/doc")
+    print(f"speedup:             {legacy / single_pass:8.2f}x")
+    print(f"lemma cache:         {normalizer.lemma_cache.stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import sys
+
+import numpy as np
+from scipy import sparse
+
+from src.model.model_building import model_building
+
+SOLVERS = ["lbfgs", "newton-cg", "liblinear", "sag", "saga"]
+
+def synthetic_bow(n_rows: int, n_features: int, tokens_per_row: int = 8) -> tuple:
+    # Zipf distributed token ids, like word counts:
+    rng = np.random.default_rng(42)
+    rows = np.repeat(np.arange(n_rows), tokens_per_row)
+    cols = rng.zipf(1.3, n_rows * tokens_per_row) % n_features
+    x = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n_rows, n_features))
+    y = (x @ rng.normal(size=n_features) + rng.normal(size=n_rows) > 0).astype(int)
+    return x, y
+
+def run(x, y, solver: str) -> str:
+    _, training = model_building(x, y, {"c": 0.1, "max_iter": 150, "solver": solver, "n_jobs": -1})
+    return f"{training['fit_time']:>8.2f}s {training['n_iter']:>5} iters  converged: {training['converged']}"
+
+def main():
+    sizes = [(40000, 300), (200000, 5000), (1000000, 20000)]
+    if len(sys.argv) > 2:
+        sizes = [(int(sys.argv[1]), int(sys.argv[2]))]
+
+    for n_rows, n_features in sizes:
+        x, y = synthetic_bow(n_rows, n_features)
+        print(f"{n_rows} rows x {n_features} features, {x.nnz} non-zeros")
+
+        # The old stage fit lbfgs on a dense frame:
+        if n_rows * n_features <= 5e7:
+            print(f"  {'lbfgs, dense':18}{run(x.toarray(), y, 'lbfgs')}")
+        for solver in SOLVERS:
+            print(f"  {solver + ', csr':18}{run(x, y, solver)}")
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,13 @@
 import pandas as pd
+import numpy as np
 from sklearn.model_selection import train_test_split
 import yaml
 import os
 
-def load_params(url: str) -> float:
+from src.data.data_io import ChunkWriter, load_format, write_frame
+from src.data.download_cache import DownloadCache
+
+def load_params(url: str) -> dict:
 
     try:
         with open(url, "r") as file:
@@ -20,7 +24,7 @@ def load_params(url: str) -> float:
         print(e)
         raise
     else:
-        return params["test_size"]
+        return params
 
 def read_data(url: str) -> pd.DataFrame:
     try:
@@ -49,29 +53,96 @@ def basic_preprocessing(df: pd.DataFrame) -> pd.DataFrame:
 
     return df
 
-def dump_data(train_data: pd.DataFrame, test_data: pd.DataFrame) -> None:
+def read_data_chunks(url: str, chunk_size: int):
+    try:
+        reader = pd.read_csv(url, chunksize=chunk_size)
+    except FileNotFoundError:
+        print("The file you are try to fetch, doesn't exist.")
+        raise
+    except Exception as e:
+        print("An unexpected error occurred.")
+        print(e)
+        raise
+    else:
+        return reader
+
+def hash_split(digests: np.ndarray, test_size: float) -> np.ndarray:
+    # Top 53 bits of the row digest as a uniform number in [0, 1):
+    position = (digests >> np.uint64(11)).astype(np.float64) / 2.0 ** 53
+    return position < test_size
+
+def stream_data(url: str, test_size: float, chunk_size: int,
+                file_path: str = os.path.join("data", "raw"), fmt: str = "csv") -> tuple:
+    os.makedirs(file_path)
+
+    seen = set()
+    n_train = n_test = 0
+
+    with ChunkWriter(file_path, "train", fmt) as train_writer, \
+            ChunkWriter(file_path, "test", fmt) as test_writer:
+        for chunk in read_data_chunks(url, chunk_size):
+            n_chunk_train, n_chunk_test = split_chunk(chunk, test_size, seen,
+                                                      train_writer, test_writer)
+            n_train += n_chunk_train
+            n_test += n_chunk_test
+
+    return n_train, n_test
+
+def split_chunk(chunk: pd.DataFrame, test_size: float, seen: set,
+                train_writer: ChunkWriter, test_writer: ChunkWriter) -> tuple:
+    chunk = basic_preprocessing(chunk)
+
+    # Drop duplicates across chunks by row digest:
+    digests = pd.util.hash_pandas_object(chunk, index=False).values
+    keep = np.zeros(len(chunk), dtype=bool)
+    for i, digest in enumerate(digests):
+        if digest not in seen:
+            seen.add(digest)
+            keep[i] = True
+
+    chunk = chunk[keep]
+    is_test = hash_split(digests[keep], test_size)
+
+    # Append each chunk as soon as it's split:
+    train_writer.write(chunk[~is_test])
+    test_writer.write(chunk[is_test])
+
+    n_test = int(is_test.sum())
+    return len(chunk) - n_test, n_test
+
+def dump_data(train_data: pd.DataFrame, test_data: pd.DataFrame, fmt: str = "csv") -> None:
     file_path = os.path.join("data", "raw")
     os.makedirs(file_path)
 
-    train_data.to_csv(os.path.join(file_path, "train.csv"), index=False)
-    test_data.to_csv(os.path.join(file_path, "test.csv"), index=False)
+    write_frame(train_data, file_path, "train", fmt)
+    write_frame(test_data, file_path, "test", fmt)
 
 def main():
 
-    # Ingest Data:
-    url = "https://raw.githubusercontent.com/PriyanshuMewal/datasets/main/emotion_dataset.csv"
-    df = read_data(url)
+    # Ingest Data (through the local download cache):
+    params = load_params("params.yaml")
+    test_size = params["test_size"]
+    fmt = load_format("params.yaml")
+
+    cache = DownloadCache(params["cache_dir"], offline=params["offline"],
+                          max_age=params["cache_max_age"])
+    url = cache.fetch(params["source"])
+
+    # Filter, de-duplicate and split chunk by chunk:
+    if params["streaming"]:
+        n_train, n_test = stream_data(url, test_size, params["chunk_size"], fmt=fmt)
+        print(f"Streamed {n_train} train and {n_test} test rows.")
+    else:
+        df = read_data(url)
 
-    # Apply basic preprocessing:
-    df = basic_preprocessing(df)
+        # Apply basic preprocessing:
+        df = basic_preprocessing(df)
 
-    # Split data:
-    params = "params.yaml"
-    test_size = load_params(params)
-    train_data, test_data = train_test_split(df, test_size=test_size, random_state=42)
+        # Split data:
+        train_data, test_data = train_test_split(df, test_size=test_size, random_state=42)
 
-    # Dump data out:
-    dump_data(train_data, test_data)
+        # Dump data out:
+        dump_data(train_data, test_data, fmt)
 
 if __name__ == "__main__":
     main()
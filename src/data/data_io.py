@@ -0,0 +1,170 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import yaml
+from scipy import sparse
+
+FORMATS = {"csv": ".csv", "parquet": ".parquet"}
+
+def load_format(url: str = "params.yaml") -> str:
+
+    try:
+        with open(url, "r") as file:
+            fmt = yaml.safe_load(file)["storage"]["format"]
+    except FileNotFoundError as e:
+        print("The file you are try to fetch, doesn't exist.")
+        raise
+    except yaml.YAMLError as e:
+        print(f"Failed to parse the yaml file at url {url}.")
+        print(e)
+        raise
+
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown storage format {fmt}, expected one of {list(FORMATS)}.")
+    return fmt
+
+def frame_url(file_path: str, name: str, fmt: str) -> str:
+    return os.path.join(file_path, name + FORMATS[fmt])
+
+def write_frame(df: pd.DataFrame, file_path: str, name: str, fmt: str) -> None:
+    url = frame_url(file_path, name, fmt)
+
+    if fmt == "parquet":
+        # Arrow has no pandas sparse type, store the dense values:
+        sparse = {col: dtype.subtype for col, dtype in df.dtypes.items()
+                  if isinstance(dtype, pd.SparseDtype)}
+        if sparse:
+            df = df.astype(sparse)
+        df.to_parquet(url, index=False)
+    else:
+        df.to_csv(url, index=False)
+
+def read_frame(file_path: str, name: str, fmt: str) -> pd.DataFrame:
+    url = frame_url(file_path, name, fmt)
+
+    try:
+        if fmt == "parquet":
+            return pd.read_parquet(url)
+        return pd.read_csv(url)
+    except FileNotFoundError:
+        print(f"At {url} file doesn't exist.")
+        raise
+
+def write_matrix(matrix, labels: np.ndarray, file_path: str, name: str) -> None:
+    # Features as CSR npz, labels as a separate npy array:
+    sparse.save_npz(os.path.join(file_path, name + ".npz"), sparse.csr_matrix(matrix))
+    np.save(os.path.join(file_path, name + "_labels.npy"), np.asarray(labels))
+
+def read_matrix(file_path: str, name: str) -> tuple:
+    url = os.path.join(file_path, name + ".npz")
+
+    try:
+        matrix = sparse.load_npz(url).tocsr()
+        labels = np.load(os.path.join(file_path, name + "_labels.npy"))
+    except FileNotFoundError:
+        print(f"At {url} file doesn't exist.")
+        raise
+
+    return matrix, labels
+
+def read_member_header(file) -> np.dtype:
+    # Position a .npy stream inside the npz zip at its first element:
+    version = np.lib.format.read_magic(file)
+    if version == (1, 0):
+        _, _, dtype = np.lib.format.read_array_header_1_0(file)
+    else:
+        _, _, dtype = np.lib.format.read_array_header_2_0(file)
+    return dtype
+
+def read_member(file, dtype: np.dtype, count: int) -> np.ndarray:
+    return np.frombuffer(file.read(int(count) * dtype.itemsize), dtype=dtype)
+
+def iter_matrix(file_path: str, name: str, batch_size: int = 10000, start: int = 0):
+    # Row batches of a write_matrix output without loading it whole: only
+    # indptr is read in full, data and indices are streamed from the zip.
+    url = os.path.join(file_path, name + ".npz")
+    labels = np.load(os.path.join(file_path, name + "_labels.npy"), mmap_mode="r")
+
+    with np.load(url) as npz:
+        if npz["format"].item() != b"csr":
+            raise ValueError(f"{url} is not a CSR matrix.")
+        indptr = npz["indptr"]
+        n_rows, n_features = npz["shape"]
+
+        with npz.zip.open("data.npy") as data_file, npz.zip.open("indices.npy") as indices_file:
+            data_dtype = read_member_header(data_file)
+            indices_dtype = read_member_header(indices_file)
+
+            # Skip the rows before start (still decompressed, never kept):
+            data_file.seek(int(indptr[start]) * data_dtype.itemsize, 1)
+            indices_file.seek(int(indptr[start]) * indices_dtype.itemsize, 1)
+
+            for row in range(start, n_rows, batch_size):
+                stop = min(row + batch_size, n_rows)
+                count = indptr[stop] - indptr[row]
+                batch = sparse.csr_matrix((read_member(data_file, data_dtype, count),
+                                           read_member(indices_file, indices_dtype, count),
+                                           indptr[row:stop + 1] - indptr[row]),
+                                          shape=(stop - row, n_features))
+                yield batch, np.asarray(labels[row:stop])
+
+def matrix_shape(file_path: str, name: str) -> tuple:
+    with np.load(os.path.join(file_path, name + ".npz")) as npz:
+        return tuple(int(size) for size in npz["shape"])
+
+def write_vocabulary(vocabulary: list, file_path: str) -> None:
+    with open(os.path.join(file_path, "vocabulary.json"), "w") as file:
+        json.dump([str(term) for term in vocabulary], file)
+
+def read_vocabulary(file_path: str) -> list:
+    with open(os.path.join(file_path, "vocabulary.json"), "r") as file:
+        return json.load(file)
+
+
+class ChunkWriter:
+    """Appends DataFrame chunks to a single csv or parquet file."""
+
+    def __init__(self, file_path: str, name: str, fmt: str):
+        self.file_path = file_path
+        self.name = name
+        self.url = frame_url(file_path, name, fmt)
+        self.fmt = fmt
+        self.writer = None
+        self.empty = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.empty is None:
+            self.empty = df.iloc[:0]
+
+        if self.fmt == "csv":
+            df.to_csv(self.url, mode="a", header=self.writer is None, index=False)
+            self.writer = True
+            return
+
+        if len(df) == 0:
+            return
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # Later chunks are cast to the first chunk's schema:
+        if self.writer is None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            self.writer = pq.ParquetWriter(self.url, table.schema)
+        else:
+            table = pa.Table.from_pandas(df, schema=self.writer.schema, preserve_index=False)
+        self.writer.write_table(table)
+
+    def close(self) -> None:
+        if self.fmt == "parquet" and self.writer is not None:
+            self.writer.close()
+        elif self.writer is None and self.empty is not None:
+            write_frame(self.empty, self.file_path, self.name, self.fmt)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
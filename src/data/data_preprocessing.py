@@ -2,14 +2,27 @@ import pandas as pd
 import numpy as np
 import re
 import os
-import nltk
+import string
+import functools
+from concurrent.futures import ProcessPoolExecutor
+import yaml
 
-nltk.download('stopwords')
-nltk.download('wordnet')
-from nltk.corpus import stopwords, wordnet
-from nltk.stem import WordNetLemmatizer
+from src.data.data_io import load_format, read_frame, write_frame
+from src.data.nltk_resources import ensure_corpora
+from src.data.text_normalizer import TextNormalizer, digits, get_normalizer
+
+# Precompiled patterns for the column-wise steps:
+PUNCTUATION_PATTERN = re.compile("[%s]" % re.escape(string.punctuation))
+WHITESPACE_PATTERN = re.compile(r"\s+")
+URL_PATTERN = re.compile(r"https?://\S+|www\.\S+")
+
+@functools.lru_cache(maxsize=None)
+def digit_pattern() -> re.Pattern:
+    return re.compile("[%s]" % re.escape(digits()))
 
 def lemmatization(text: str) -> str:
+    ensure_corpora()
+    from nltk.stem import WordNetLemmatizer
     lemmatizer = WordNetLemmatizer()
 
     text = text.split()
@@ -18,6 +31,8 @@ def lemmatization(text: str) -> str:
     return " ".join(text)
 
 def remove_stop_words(text: str) -> str:
+    ensure_corpora()
+    from nltk.corpus import stopwords
     try:
         stop_words = set(stopwords.words("english"))
     except Exception:
@@ -57,30 +72,119 @@ def remove_small_sentences(df: pd.DataFrame) -> None:
         if len(df.text.iloc[i].split()) < 3:
             df.text.iloc[i] = np.nan
 
-def normalize_text(df: pd.DataFrame) -> pd.DataFrame:
-    df.content = df.content.apply(lambda content : lower_case(content))
-    df.content = df.content.apply(lambda content : remove_stop_words(content))
-    df.content = df.content.apply(lambda content : removing_numbers(content))
-    df.content = df.content.apply(lambda content : removing_punctuations(content))
-    df.content = df.content.apply(lambda content : removing_urls(content))
-    df.content = df.content.apply(lambda content : lemmatization(content))
+def load_params(url: str) -> dict:
+
+    try:
+        with open(url, "r") as file:
+            params = yaml.safe_load(file)["data_preprocessing"]
+    except FileNotFoundError as e:
+        print("The file you are try to fetch, doesn't exist.")
+        raise
+    except yaml.YAMLError as e:
+        print(f"Failed to parse the yaml file at url {url}.")
+        print(e)
+        raise
+    except Exception as e:
+        print("An unknown error occurred.")
+        print(e)
+        raise
+    else:
+        return params
+
+def normalize_text(df: pd.DataFrame, normalizer: TextNormalizer = None) -> pd.DataFrame:
+    # All six steps above in a single pass per document:
+    if normalizer is None:
+        normalizer = get_normalizer()
+    df.content = df.content.apply(normalizer.normalize)
     return df
 
-def dump_data(train_data: pd.DataFrame, test_data: pd.DataFrame) -> None:
+def normalize_text_vectorized(df: pd.DataFrame, normalizer: TextNormalizer = None) -> pd.DataFrame:
+    if normalizer is None:
+        normalizer = get_normalizer()
+    stop_words = normalizer.stop_words
+    lemmatize = normalizer.lemmatize
+
+    content = df.content.str.lower()
+
+    # Stop words are the only per-token step before lemmatization:
+    content = content.map(lambda text: " ".join([i for i in text.split() if i not in stop_words]))
+
+    content = content.str.replace(digit_pattern(), "", regex=True)
+    content = content.str.replace(PUNCTUATION_PATTERN, " ", regex=True)
+    content = content.str.replace(WHITESPACE_PATTERN, " ", regex=True).str.strip()
+    content = content.str.replace(URL_PATTERN, "", regex=True)
+
+    df.content = content.map(lambda text: " ".join([lemmatize(y) for y in text.split()]))
+    return df
+
+_worker_normalizer = None
+
+def _init_worker(lemma_cache_size: int) -> None:
+    global _worker_normalizer
+    _worker_normalizer = TextNormalizer(lemma_cache_size=lemma_cache_size)
+
+def _normalize_chunk(chunk: list) -> list:
+    return [_worker_normalizer.normalize(content) for content in chunk]
+
+def normalize_text_parallel(frames: list, n_jobs: int = -1, chunk_size: int = 10000,
+                            lemma_cache_size: int = 50000) -> list:
+    if n_jobs == -1:
+        n_jobs = os.cpu_count()
+
+    # Shard every frame into chunks so train and test share one pool:
+    chunks = []
+    for df in frames:
+        content = df.content.tolist()
+        chunks.extend(content[i:i + chunk_size] for i in range(0, len(content), chunk_size))
+
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                             initargs=(lemma_cache_size,)) as executor:
+        # map() yields results in submission order:
+        results = iter(executor.map(_normalize_chunk, chunks))
+
+        for df in frames:
+            content = []
+            while len(content) < len(df):
+                content.extend(next(results))
+            df.content = content
+
+    return frames
+
+def normalize_frames(train_data: pd.DataFrame, test_data: pd.DataFrame, params: dict) -> tuple:
+    if params["vectorized"] or params["n_jobs"] == 1:
+        normalizer = TextNormalizer(lemma_cache_size=params["lemma_cache_size"])
+        normalize = normalize_text_vectorized if params["vectorized"] else normalize_text
+
+        train_data = normalize(train_data, normalizer)
+        test_data = normalize(test_data, normalizer)
+
+        print(f"Lemma cache: {normalizer.lemma_cache.stats()}")
+    else:
+        train_data, test_data = normalize_text_parallel(
+            [train_data, test_data],
+            n_jobs=params["n_jobs"],
+            chunk_size=params["chunk_size"],
+            lemma_cache_size=params["lemma_cache_size"]
+        )
+
+    return train_data, test_data
+
+def dump_data(train_data: pd.DataFrame, test_data: pd.DataFrame, fmt: str = "csv") -> None:
     # Create path
     file_path = os.path.join("data", "interim")
     os.mkdir(file_path)
 
     # Save
-    train_data.to_csv(os.path.join(file_path, "train.csv"), index=False)
-    test_data.to_csv(os.path.join(file_path, "test.csv"), index=False)
+    write_frame(train_data, file_path, "train", fmt)
+    write_frame(test_data, file_path, "test", fmt)
 
 def main():
 
     # Load data:
+    fmt = load_format("params.yaml")
     try:
-        train_data = pd.read_csv("data/raw/train.csv")
-        test_data = pd.read_csv("data/raw/test.csv")
+        train_data = read_frame("data/raw", "train", fmt)
+        test_data = read_frame("data/raw", "test", fmt)
     except FileNotFoundError:
         print("The file you are trying to fetch isn't there.")
         raise
@@ -90,11 +194,11 @@ def main():
         raise
 
     # Clean data:
-    train_data = normalize_text(train_data)
-    test_data = normalize_text(test_data)
+    params = load_params("params.yaml")
+    train_data, test_data = normalize_frames(train_data, test_data, params)
 
     # Dump data:
-    dump_data(train_data, test_data)
+    dump_data(train_data, test_data, fmt)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,136 @@
+import hashlib
+import http.client
+import json
+import os
+import shutil
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+
+class DownloadCache:
+    """Content-addressed cache for remote files.
+
+    Blobs are stored as <sha256><ext> under cache_dir and index.json maps
+    each url to its blob, ETag and fetch time.
+    """
+
+    def __init__(self, cache_dir: str = ".cache/datasets", offline: bool = False,
+                 max_age: float = 86400, timeout: float = 60):
+        self.cache_dir = cache_dir
+        self.offline = offline
+        self.max_age = max_age
+        self.timeout = timeout
+        self.index_url = os.path.join(cache_dir, "index.json")
+
+    def load_index(self) -> dict:
+        try:
+            with open(self.index_url, "r") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+
+    def save_index(self, index: dict) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_url = self.index_url + ".tmp"
+        with open(tmp_url, "w") as file:
+            json.dump(index, file, indent=4)
+        os.replace(tmp_url, self.index_url)
+
+    def blob_url(self, entry: dict) -> str:
+        return os.path.join(self.cache_dir, entry["blob"])
+
+    def cached(self, url: str):
+        entry = self.load_index().get(url)
+        if entry is not None and os.path.exists(self.blob_url(entry)):
+            return entry
+        return None
+
+    def fetch(self, url: str) -> str:
+
+        # Local sources are read in place:
+        if url.startswith("file://"):
+            url = url[len("file://"):]
+        if "://" not in url:
+            if not os.path.exists(url):
+                raise FileNotFoundError(f"{url} file doesn't exist.")
+            print(f"Dataset source is a local file: {url}")
+            return url
+
+        entry = self.cached(url)
+
+        if self.offline:
+            if entry is None:
+                raise FileNotFoundError(f"Offline mode and {url} isn't cached in {self.cache_dir}.")
+            print(f"Dataset cache hit (offline): {url}")
+            return self.blob_url(entry)
+
+        if entry is not None and time.time() - entry["fetched_at"] < self.max_age:
+            print(f"Dataset cache hit: {url}")
+            return self.blob_url(entry)
+
+        try:
+            return self.download(url, entry)
+        except (urllib.error.URLError, OSError, http.client.HTTPException) as e:
+            # Also a timeout or dropped connection halfway through the body:
+            if entry is None:
+                print("An error occurred while downloading the dataset.")
+                print(e)
+                raise
+            print(f"Download failed ({e}), serving the cached copy of {url}")
+            return self.blob_url(entry)
+
+    def download(self, url: str, entry: dict = None) -> str:
+        request = urllib.request.Request(url)
+        if entry is not None and entry.get("etag"):
+            request.add_header("If-None-Match", entry["etag"])
+
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                print(f"Dataset cache hit (ETag unchanged): {url}")
+                self.touch(url, entry)
+                return self.blob_url(entry)
+            raise
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        sha256 = hashlib.sha256()
+
+        # Hash while streaming to a temp file, then move it to its digest:
+        with response, tempfile.NamedTemporaryFile(dir=self.cache_dir, delete=False) as tmp:
+            try:
+                for block in iter(lambda: response.read(1 << 20), b""):
+                    sha256.update(block)
+                    tmp.write(block)
+
+                # read() returns short instead of raising when the connection drops:
+                if response.length:
+                    raise http.client.IncompleteRead(b"", response.length)
+            except BaseException:
+                tmp.close()
+                os.remove(tmp.name)
+                raise
+            etag = response.headers.get("ETag")
+
+        ext = os.path.splitext(url.split("?")[0])[1]
+        blob = sha256.hexdigest() + ext
+        blob_url = os.path.join(self.cache_dir, blob)
+
+        if entry is not None and entry["blob"] == blob:
+            print(f"Dataset cache hit (content unchanged): {url}")
+        else:
+            print(f"Dataset cache miss: {url}")
+        shutil.move(tmp.name, blob_url)
+
+        index = self.load_index()
+        index[url] = {"blob": blob, "etag": etag, "fetched_at": time.time()}
+        self.save_index(index)
+
+        return blob_url
+
+    def touch(self, url: str, entry: dict) -> None:
+        index = self.load_index()
+        index[url] = dict(entry, fetched_at=time.time())
+        self.save_index(index)
@@ -0,0 +1,69 @@
+import functools
+import pickle
+
+
+class LemmaCache:
+    """Bounded LRU cache in front of WordNetLemmatizer.lemmatize.
+
+    Tokens passed to warm() are pinned and never evicted, so a vocabulary
+    warmed at startup never has to reach WordNet again.
+    """
+
+    def __init__(self, lemmatizer, max_size: int = 50000):
+        self.lemmatizer = lemmatizer
+        self.max_size = max_size
+        self.pinned = {}
+        self.pinned_hits = 0
+        self._lemmatize = functools.lru_cache(maxsize=max_size)(lemmatizer.lemmatize)
+
+    def lemmatize(self, token: str) -> str:
+        lemma = self.pinned.get(token)
+        if lemma is None:
+            return self._lemmatize(token)
+
+        self.pinned_hits += 1
+        return lemma
+
+    def warm(self, tokens) -> int:
+        lemmatize = self.lemmatizer.lemmatize
+        for token in tokens:
+            self.pinned[token] = lemmatize(token)
+
+        return len(self.pinned)
+
+    def warm_from_vectorizer(self, url: str) -> int:
+        try:
+            with open(url, "rb") as file:
+                vectorizer = pickle.load(file)
+        except FileNotFoundError:
+            print(f"{url} file doesn't exist.")
+            raise
+        except pickle.PickleError as e:
+            print("Having trouble to parse the pickle file.")
+            print(e)
+            raise
+
+        # Hashing vectorizers have no vocabulary to warm from:
+        return self.warm(getattr(vectorizer, "vocabulary_", {}))
+
+    def clear(self) -> None:
+        self.pinned.clear()
+        self.pinned_hits = 0
+        self._lemmatize.cache_clear()
+
+    def stats(self) -> dict:
+        info = self._lemmatize.cache_info()
+
+        # Every miss inserts one entry, so whatever isn't there was evicted:
+        hits = info.hits + self.pinned_hits
+        lookups = hits + info.misses
+
+        return {
+            "hits": hits,
+            "misses": info.misses,
+            "evictions": info.misses - info.currsize,
+            "size": info.currsize,
+            "pinned": len(self.pinned),
+            "max_size": self.max_size,
+            "hit_rate": hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,34 @@
+import os
+
+# Corpora are looked up here first, then in NLTK's default locations:
+NLTK_DATA = os.getenv("NLTK_DATA", os.path.join(".cache", "nltk_data"))
+CORPORA = ("stopwords", "wordnet")
+
+_checked = set()
+
+def ensure_corpora(names: tuple = CORPORA, download_dir: str = NLTK_DATA, offline: bool = None) -> None:
+    # Resolve each corpus once per process, downloading only what is missing:
+    if (names, download_dir) in _checked:
+        return
+
+    import nltk
+
+    if offline is None:
+        offline = os.getenv("NLTK_OFFLINE", "0") == "1"
+    if download_dir not in nltk.data.path:
+        nltk.data.path.insert(0, download_dir)
+
+    for name in names:
+        try:
+            nltk.data.find(f"corpora/{name}")
+        except LookupError:
+            if offline:
+                raise LookupError(f"NLTK corpus {name} is not in {nltk.data.path} and NLTK_OFFLINE is set.")
+            nltk.download(name, download_dir=download_dir, quiet=True)
+
+    _checked.add((names, download_dir))
+
+
+if __name__ == "__main__":
+    # Fetch the corpora ahead of time, e.g. while building an image:
+    ensure_corpora()
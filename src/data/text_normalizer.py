@@ -0,0 +1,75 @@
+import functools
+import string
+import sys
+
+from src.data.lemma_cache import LemmaCache
+from src.data.nltk_resources import ensure_corpora
+
+@functools.lru_cache(maxsize=None)
+def digits() -> str:
+    # Every character str.isdigit() accepts, not just ASCII 0-9:
+    return "".join(chr(i) for i in range(sys.maxunicode + 1) if chr(i).isdigit())
+
+class TextNormalizer:
+    """Single-pass version of the six step normalize_text pipeline.
+
+    Output is byte-identical to running lower_case, remove_stop_words,
+    removing_numbers, removing_punctuations, removing_urls and lemmatization
+    one after the other.
+    """
+
+    def __init__(self, language: str = "english", lemma_cache_size: int = 50000):
+        # NLTK is only imported once a normalizer is actually built:
+        ensure_corpora()
+        from nltk.corpus import stopwords
+        from nltk.stem import WordNetLemmatizer
+
+        try:
+            self.stop_words = frozenset(stopwords.words(language))
+        except Exception:
+            print("An error has occurred. If stopwords aren't there please download.")
+            raise
+
+        # Digits are dropped, punctuation turns into a token separator:
+        table = {ord(c): None for c in digits()}
+        table.update({ord(c): " " for c in string.punctuation})
+        self.table = table
+
+        self.lemmatizer = WordNetLemmatizer()
+        self.lemma_cache = LemmaCache(self.lemmatizer, max_size=lemma_cache_size)
+        self.lemmatize = self.lemma_cache.lemmatize
+
+    def normalize(self, text: str) -> str:
+        stop_words = self.stop_words
+        table = self.table
+        lemmatize = self.lemmatize
+
+        tokens = []
+        for token in text.split():
+            token = token.lower()
+
+            # Stop words are matched before digits and punctuation go away:
+            if token in stop_words:
+                continue
+
+            # No url can survive punctuation removal ("://" and "www." are
+            # both split apart), so the url step never matches anything.
+            for part in token.translate(table).split():
+                tokens.append(lemmatize(part))
+
+        return " ".join(tokens)
+
+    def __call__(self, text: str) -> str:
+        return self.normalize(text)
+
+
+_normalizer = None
+
+def get_normalizer() -> TextNormalizer:
+    global _normalizer
+
+    # Build stop words, tables and lemmatizer once per process:
+    if _normalizer is None:
+        _normalizer = TextNormalizer()
+
+    return _normalizer
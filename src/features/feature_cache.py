@@ -0,0 +1,217 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Code whose output the cached artifacts depend on, part of every key:
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SOURCES = {
+    "normalized": ["src/data/data_preprocessing.py", "src/data/text_normalizer.py"],
+    "features": ["src/features/feature_engineering.py"],
+    "sweep": ["src/model/hyperparameter_sweep.py"],
+}
+
+
+def hash_part(part, sha256) -> None:
+    # Content, not identity: frames by their values, dicts by sorted json:
+    if isinstance(part, pd.DataFrame):
+        sha256.update(json.dumps(list(map(str, part.columns))).encode())
+        sha256.update(pd.util.hash_pandas_object(part, index=False).values.tobytes())
+    elif isinstance(part, np.ndarray):
+        sha256.update(pd.util.hash_array(np.asarray(part).ravel()).tobytes())
+    elif isinstance(part, bytes):
+        sha256.update(part)
+    else:
+        sha256.update(json.dumps(part, sort_keys=True, default=str).encode())
+
+
+def make_key(kind: str, *parts) -> str:
+    sha256 = hashlib.sha256(kind.encode())
+    for source in SOURCES.get(kind, []):
+        with open(os.path.join(ROOT, source), "rb") as file:
+            sha256.update(file.read())
+    for part in parts:
+        hash_part(part, sha256)
+    return sha256.hexdigest()
+
+
+def write_artifact(value, file_path: str, name: str) -> str:
+    if isinstance(value, pd.DataFrame):
+        file_name = name + ".parquet"
+        value.to_parquet(os.path.join(file_path, file_name), index=False)
+    elif sparse.issparse(value):
+        file_name = name + ".npz"
+        sparse.save_npz(os.path.join(file_path, file_name), sparse.csr_matrix(value))
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        file_name = name + ".npy"
+        np.save(os.path.join(file_path, file_name), value)
+    else:
+        # Fitted vectorizers, vocabularies and anything else:
+        file_name = name + ".pkl"
+        with open(os.path.join(file_path, file_name), "wb") as file:
+            pickle.dump(value, file)
+    return file_name
+
+
+def read_artifact(url: str):
+    ext = os.path.splitext(url)[1]
+    if ext == ".parquet":
+        return pd.read_parquet(url)
+    if ext == ".npz":
+        return sparse.load_npz(url).tocsr()
+    if ext == ".npy":
+        return np.load(url)
+    with open(url, "rb") as file:
+        return pickle.load(file)
+
+
+def directory_size(file_path: str) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(file_path) if entry.is_file())
+
+
+class FeatureCache:
+    """Content-addressed cache for normalized text and feature matrices.
+
+    Each entry is a directory <key>/ under cache_dir holding one file per
+    artifact. The key hashes the input data, the options and the code that
+    produced it (see make_key). index.json records every entry's size and
+    last use; once the total passes max_bytes the least recently used
+    entries are evicted.
+    """
+
+    def __init__(self, cache_dir: str = ".cache/features", max_bytes: int = 2 * 2**30):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_url = os.path.join(cache_dir, "index.json")
+
+    def load_index(self) -> dict:
+        try:
+            with open(self.index_url, "r") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+
+    def save_index(self, index: dict) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_url = self.index_url + ".tmp"
+        with open(tmp_url, "w") as file:
+            json.dump(index, file, indent=4)
+        os.replace(tmp_url, self.index_url)
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key: str):
+        index = self.load_index()
+        entry = index.get(key)
+        if entry is None or not os.path.isdir(self.entry_path(key)):
+            return None
+
+        artifacts = {name: read_artifact(os.path.join(self.entry_path(key), file_name))
+                     for name, file_name in entry["artifacts"].items()}
+
+        index[key] = dict(entry, used_at=time.time())
+        self.save_index(index)
+
+        return artifacts
+
+    def store(self, key: str, artifacts: dict, kind: str = None) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Write everything to a temp dir, then move it to its key:
+        tmp = tempfile.mkdtemp(dir=self.cache_dir)
+        try:
+            files = {name: write_artifact(value, tmp, name) for name, value in artifacts.items()}
+            size = directory_size(tmp)
+            shutil.rmtree(self.entry_path(key), ignore_errors=True)
+            os.replace(tmp, self.entry_path(key))
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        now = time.time()
+        index = self.load_index()
+        index[key] = {"kind": kind, "artifacts": files, "bytes": size, "created_at": now, "used_at": now}
+        self.evict(index, keep=key)
+        self.save_index(index)
+
+    def evict(self, index: dict, keep: str = None) -> list:
+        # Least recently used first, never the entry just written:
+        evicted = []
+        total = sum(entry["bytes"] for entry in index.values())
+        for key in sorted(index, key=lambda key: index[key]["used_at"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= index[key]["bytes"]
+            shutil.rmtree(self.entry_path(key), ignore_errors=True)
+            del index[key]
+            evicted.append(key)
+
+        if evicted:
+            print(f"Feature cache evicted {len(evicted)} entries, {total / 2**20:.1f} MB left.")
+        return evicted
+
+    def cached(self, kind: str, key: str, compute) -> dict:
+        artifacts = self.load(key)
+        if artifacts is not None:
+            print(f"Feature cache hit ({kind}): {key[:12]}")
+            return artifacts
+
+        print(f"Feature cache miss ({kind}): {key[:12]}")
+        artifacts = compute()
+        self.store(key, artifacts, kind)
+        return artifacts
+
+    def stats(self) -> dict:
+        index = self.load_index()
+        return {"entries": len(index), "bytes": sum(entry["bytes"] for entry in index.values()),
+                "max_bytes": self.max_bytes}
+
+
+def get_cache(params: dict = None) -> FeatureCache:
+    params = params or {}
+    return FeatureCache(params.get("cache_dir", ".cache/features"),
+                        int(params.get("max_size_mb", 2048) * 2**20))
+
+
+def normalize_cached(train_data: pd.DataFrame, test_data: pd.DataFrame, params: dict,
+                     cache: FeatureCache) -> tuple:
+    from src.data.data_preprocessing import normalize_frames
+
+    # Worker count and chunking don't change the output, keep them out of the key:
+    options = {"vectorized": bool(params["vectorized"])}
+    key = make_key("normalized", train_data, test_data, options)
+
+    # Stored frames come back with a fresh RangeIndex, give a miss the same:
+    def compute() -> dict:
+        train, test = normalize_frames(train_data.copy(), test_data.copy(), params)
+        return {"train": train.reset_index(drop=True), "test": test.reset_index(drop=True)}
+
+    artifacts = cache.cached("normalized", key, compute)
+    return artifacts["train"], artifacts["test"]
+
+
+def vectorize_cached(train_data: pd.DataFrame, test_data: pd.DataFrame, params: dict,
+                     cache: FeatureCache) -> tuple:
+    from src.features.feature_engineering import vectorize
+
+    options = {name: params.get(name) for name in ("mode", "max_features", "n_features", "tfidf")}
+    key = make_key("features", train_data, test_data, options)
+
+    def compute() -> dict:
+        train_bow, test_bow, vocabulary, vectorizer = vectorize(train_data, test_data, params)
+        return {"x_train": train_bow[0], "y_train": train_bow[1], "x_test": test_bow[0],
+                "y_test": test_bow[1], "vocabulary": vocabulary, "vectorizer": vectorizer}
+
+    artifacts = cache.cached("features", key, compute)
+    return ((artifacts["x_train"], artifacts["y_train"]), (artifacts["x_test"], artifacts["y_test"]),
+            artifacts["vocabulary"], artifacts["vectorizer"])
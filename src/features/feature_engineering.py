@@ -1,15 +1,20 @@
 import pandas as pd
-from sklearn.feature_extraction.text import CountVectorizer
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer, TfidfTransformer
+from sklearn.pipeline import make_pipeline
 import yaml
 import os
 import pickle
+from concurrent.futures import ProcessPoolExecutor
 
-def load_data(train_url: str, test_url: str) -> tuple:
+from src.data.data_io import load_format, read_frame, write_matrix, write_vocabulary
+
+def load_data(file_path: str, fmt: str = "csv") -> tuple:
 
     # Load data:
     try:
-      train_data = pd.read_csv(train_url)
-      test_data = pd.read_csv(test_url)
+      train_data = read_frame(file_path, "train", fmt)
+      test_data = read_frame(file_path, "test", fmt)
     except FileNotFoundError:
         print("File does not exist.")
         raise
@@ -29,20 +34,84 @@ def save_trf(model):
     with open("models/vectorizer.pkl", "wb") as vector:
         pickle.dump(model, vector)
 
-def bag_of_words(train_data: pd.DataFrame, test_data: pd.DataFrame) -> tuple:
+def build_vectorizer(params: dict):
 
-    # Split data:
-    x_train = train_data["content"].values
-    y_train = train_data["sentiment"].values
+    mode = params.get("mode", "bow")
+    if mode == "bow":
+        return CountVectorizer(max_features=params["max_features"])
 
-    x_test = test_data["content"].values
-    y_test = test_data["sentiment"].values
+    if mode == "hashing":
+        # Stateless raw counts, optionally reweighted by idf:
+        hashing = HashingVectorizer(n_features=params["n_features"],
+                                    alternate_sign=False, norm=None)
+        if params.get("tfidf", False):
+            return make_pipeline(hashing, TfidfTransformer())
+        return hashing
+
+    raise ValueError(f"Unknown feature_engineering mode {mode}, expected bow or hashing.")
+
+_worker_vectorizer = None
+
+def _init_worker(vectorizer) -> None:
+    global _worker_vectorizer
+    _worker_vectorizer = vectorizer
+
+def _transform_chunk(chunk) -> sparse.csr_matrix:
+    return _worker_vectorizer.transform(chunk)
+
+class TransformPool:
+    """Process pool whose workers all hold one fitted vectorizer.
+
+    The vectorizer is shipped to every worker once, at creation; keep the
+    pool next to it so a swapped vectorizer can't be mixed with the old one.
+    """
+
+    def __init__(self, vectorizer, n_jobs: int = -1):
+        if n_jobs == -1:
+            n_jobs = os.cpu_count()
+        self.vectorizer = vectorizer
+        self.executor = ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                            initargs=(vectorizer,))
+
+    def map(self, fn, *iterables):
+        return self.executor.map(fn, *iterables)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+def make_transform_pool(vectorizer, n_jobs: int = -1) -> TransformPool:
+    return TransformPool(vectorizer, n_jobs)
+
+def parallel_transform(vectorizer, docs, n_jobs: int = -1, chunk_size: int = 10000,
+                       executor: TransformPool = None) -> sparse.csr_matrix:
+    if executor is not None and executor.vectorizer is not vectorizer:
+        raise ValueError("The transform pool was created for another vectorizer, "
+                         "make a new pool after swapping vectorizers.")
+
+    chunks = [docs[i:i + chunk_size] for i in range(0, len(docs), chunk_size)]
+
+    if len(chunks) <= 1 or (n_jobs == 1 and executor is None):
+        return sparse.csr_matrix(vectorizer.transform(docs))
+
+    # A caller-owned pool (e.g. the serving app) is reused, not shut down:
+    pool = executor or make_transform_pool(vectorizer, n_jobs)
+    try:
+        return sparse.vstack(list(pool.map(_transform_chunk, chunks)), format="csr")
+    finally:
+        if executor is None:
+            pool.shutdown()
+
+def load_params(url: str) -> dict:
 
-    # Feature Engineering (Bag of Words)
-    url = "params.yaml"
     try:
         with open(url, "r") as file:
-                cols = yaml.safe_load(file)["feature_engineering"]["max_features"]
+                params = yaml.safe_load(file)["feature_engineering"]
     except FileNotFoundError as e:
         print("The file you are try to fetch, doesn't exist.")
         raise
@@ -55,45 +124,69 @@ def bag_of_words(train_data: pd.DataFrame, test_data: pd.DataFrame) -> tuple:
         print(e)
         raise
     else:
-        vectorizer = CountVectorizer(max_features=cols)
+        return params
 
-    x_train_bow = vectorizer.fit_transform(x_train)
-    x_test_bow = vectorizer.transform(x_test)
+def vectorize(train_data: pd.DataFrame, test_data: pd.DataFrame, params: dict) -> tuple:
 
-    # Change formate:
-    x_train_bow = pd.DataFrame.sparse.from_spmatrix(x_train_bow, columns=vectorizer.get_feature_names_out())
-    x_test_bow = pd.DataFrame.sparse.from_spmatrix(x_test_bow, columns=vectorizer.get_feature_names_out())
+    # Split data:
+    x_train = train_data["content"].values
+    y_train = train_data["sentiment"].values
 
-    # Adding target column:
-    x_train_bow["sentiment"] = y_train
-    x_test_bow["sentiment"] = y_test
+    x_test = test_data["content"].values
+    y_test = test_data["sentiment"].values
+
+    # Feature Engineering (Bag of Words or feature hashing)
+    vectorizer = build_vectorizer(params)
+
+    # Hashing needs no fit pass, so train can be transformed in parallel too:
+    n_jobs, chunk_size = params.get("n_jobs", 1), params.get("chunk_size", 10000)
+    if isinstance(vectorizer, HashingVectorizer):
+        x_train_bow = parallel_transform(vectorizer, x_train, n_jobs, chunk_size)
+    else:
+        x_train_bow = vectorizer.fit_transform(x_train)
+    x_test_bow = parallel_transform(vectorizer, x_test, n_jobs, chunk_size)
+
+    # Features stay CSR, labels and vocabulary travel next to them:
+    train_bow = (x_train_bow, y_train)
+    test_bow = (x_test_bow, y_test)
+
+    # Hashed features have no vocabulary to ship:
+    vocabulary = None
+    if isinstance(vectorizer, CountVectorizer):
+        vocabulary = vectorizer.get_feature_names_out()
+
+    return train_bow, test_bow, vocabulary, vectorizer
+
+def bag_of_words(train_data: pd.DataFrame, test_data: pd.DataFrame) -> tuple:
+    params = load_params("params.yaml")
+    train_bow, test_bow, vocabulary, vectorizer = vectorize(train_data, test_data, params)
 
     # Save vectorizer:
     save_trf(vectorizer)
 
-    return x_train_bow, x_test_bow
+    return train_bow, test_bow, vocabulary
 
-def dump_data(train_bow: pd.DataFrame, test_bow: pd.DataFrame) -> None:
+def dump_data(train_bow: tuple, test_bow: tuple, vocabulary: list) -> None:
 
     file_path = os.path.join("data", "processed")
     os.mkdir(file_path)
 
-    train_bow.to_csv(os.path.join(file_path, "train_bow.csv"), index=False)
-    test_bow.to_csv(os.path.join(file_path, "test_bow.csv"), index=False)
+    write_matrix(*train_bow, file_path, "train_bow")
+    write_matrix(*test_bow, file_path, "test_bow")
+    if vocabulary is not None:
+        write_vocabulary(vocabulary, file_path)
 
 def main():
 
     # Ingestion:
-    train_url = "data/interim/train.csv"
-    test_url = "data/interim/test.csv"
-
-    train_data, test_data = load_data(train_url, test_url)
+    fmt = load_format("params.yaml")
+    train_data, test_data = load_data("data/interim", fmt)
 
     # Apply feature engineering -> Bag of words:
-    train_bow, test_bow = bag_of_words(train_data, test_data)
+    train_bow, test_bow, vocabulary = bag_of_words(train_data, test_data)
 
     # Export data
-    dump_data(train_bow, test_bow)
+    dump_data(train_bow, test_bow, vocabulary)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
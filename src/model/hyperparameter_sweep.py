@@ -0,0 +1,163 @@
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.metrics import accuracy_score, precision_score, recall_score, roc_auc_score
+from sklearn.model_selection import ParameterGrid, ParameterSampler, train_test_split
+from scipy import sparse
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import numpy as np
+import json
+import os
+import yaml
+
+from src.data.data_io import load_format
+from src.features.feature_cache import FeatureCache, get_cache, make_key
+from src.features.feature_engineering import load_data
+from src.model.model_building import model_building, resolve_n_jobs
+
+def load_params(url: str) -> dict:
+
+    try:
+        with open(url, "r") as file:
+            params = yaml.safe_load(file)
+    except FileNotFoundError as e:
+        print("The file you are try to fetch, doesn't exist.")
+        raise
+    except yaml.YAMLError as e:
+        print(f"Failed to parse the yaml file at url {url}.")
+        print(e)
+        raise
+    except Exception as e:
+        print("An unexpected error occurred.")
+        print(e)
+        raise
+    else:
+        return params
+
+def build_configs(sweep: dict) -> list:
+    grid = {name: list(values) for name, values in sweep["grid"].items()}
+
+    if sweep.get("search", "grid") == "grid":
+        return list(ParameterGrid(grid))
+    if sweep["search"] == "random":
+        n_iter = min(sweep.get("n_iter", 10), len(ParameterGrid(grid)))
+        return list(ParameterSampler(grid, n_iter, random_state=sweep.get("random_state", 42)))
+
+    raise ValueError(f"Unknown search {sweep['search']}, expected grid or random.")
+
+def top_features(x: sparse.csr_matrix, max_features: int) -> np.ndarray:
+    # Same columns CountVectorizer(max_features=k) keeps: the k most frequent
+    # terms, in the alphabetical order of the full vocabulary:
+    term_counts = np.asarray(x.sum(axis=0)).ravel()
+    return np.sort((-term_counts).argsort()[:max_features])
+
+def featurize(train_data: pd.DataFrame, sweep: dict, cache: FeatureCache = None) -> tuple:
+    validation_size, random_state = sweep.get("validation_size", 0.2), sweep.get("random_state", 42)
+
+    def compute() -> dict:
+        # One full-vocabulary fit, every max_features is a column subset of it:
+        x_train, x_val, y_train, y_val = train_test_split(
+            train_data["content"].values, train_data["sentiment"].values,
+            test_size=validation_size, random_state=random_state,
+            stratify=train_data["sentiment"].values)
+
+        vectorizer = CountVectorizer()
+        return {"x_train": vectorizer.fit_transform(x_train), "y_train": y_train,
+                "x_val": vectorizer.transform(x_val), "y_val": y_val}
+
+    if cache is None:
+        data = compute()
+    else:
+        key = make_key("sweep", train_data, {"validation_size": validation_size, "random_state": random_state})
+        data = cache.cached("sweep", key, compute)
+
+    return data["x_train"], data["y_train"], data["x_val"], data["y_val"]
+
+def _init_worker(x_train, y_train, x_val, y_val) -> None:
+    global _worker_data, _worker_columns
+    _worker_data = (x_train, y_train, x_val, y_val)
+    _worker_columns = {}
+
+def _run_config(config: dict) -> dict:
+    x_train, y_train, x_val, y_val = _worker_data
+
+    # Column subsets are computed once per worker and max_features:
+    max_features = config["max_features"]
+    if max_features not in _worker_columns:
+        _worker_columns[max_features] = top_features(x_train, max_features)
+    columns = _worker_columns[max_features]
+
+    # One core per configuration, the pool provides the parallelism:
+    params = dict(config, n_jobs=1)
+    model, training = model_building(x_train[:, columns], y_train, params)
+
+    y_pred = model.predict(x_val[:, columns])
+    y_prob = model.predict_proba(x_val[:, columns])[:, 1]
+
+    return dict(
+        config,
+        accuracy=accuracy_score(y_val, y_pred),
+        precision=precision_score(y_val, y_pred, zero_division=0),
+        recall=recall_score(y_val, y_pred),
+        auc=roc_auc_score(y_val, y_prob),
+        fit_time=training["fit_time"],
+        n_iter=training["n_iter"],
+        converged=training["converged"]
+    )
+
+def run_sweep(train_data: pd.DataFrame, sweep: dict, defaults: dict, cache: FeatureCache = None) -> pd.DataFrame:
+    # Unswept model_building settings (solver, tol, ...) come from defaults:
+    configs = [dict(defaults, **config) for config in build_configs(sweep)]
+    data = featurize(train_data, sweep, cache)
+
+    n_jobs = resolve_n_jobs(sweep.get("n_jobs", -1))
+
+    # Ship the featurized matrices to every worker once, not per configuration:
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=data) as pool:
+        results = list(pool.map(_run_config, configs))
+
+    metric = sweep.get("metric", "auc")
+    table = pd.DataFrame(results).sort_values(metric, ascending=False, kind="stable").reset_index(drop=True)
+    table.insert(0, "rank", np.arange(1, len(table) + 1))
+
+    return table
+
+def save_results(table: pd.DataFrame, sweep: dict, url: str = "reports/sweep.csv",
+                 best_url: str = "reports/sweep_best.json") -> dict:
+    os.makedirs(os.path.dirname(url), exist_ok=True)
+    table.to_csv(url, index=False)
+
+    best = table.iloc[0]
+    metric = sweep.get("metric", "auc")
+    best_params = {
+        "params": {name: best[name].item() if hasattr(best[name], "item") else best[name]
+                   for name in sweep["grid"]},
+        "metric": metric,
+        metric: float(best[metric])
+    }
+    with open(best_url, "w") as file:
+        json.dump(best_params, file, indent=4)
+
+    return best_params
+
+def main():
+
+    # Ingestion:
+    fmt = load_format("params.yaml")
+    train_data, _ = load_data("data/interim", fmt)
+
+    # Sweep on a validation split of train, test stays untouched for evaluation:
+    params = load_params("params.yaml")
+    sweep = params["sweep"]
+    defaults = {name: value for name, value in params["model_building"].items()
+                if name in ("c", "max_iter", "solver", "tol")}
+    defaults["max_features"] = params["feature_engineering"]["max_features"]
+
+    # Repeated sweeps over the same data skip the vectorizer fit:
+    table = run_sweep(train_data, sweep, defaults, get_cache(params.get("feature_cache")))
+    best = save_results(table, sweep)
+
+    print(table.head(10).to_string(index=False))
+    print(f"Best params: {best['params']} ({best['metric']} = {best[best['metric']]:.4f})")
+
+if __name__ == "__main__":
+    main()
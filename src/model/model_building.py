@@ -1,13 +1,23 @@
-from sklearn.linear_model import LogisticRegression
-import pandas as pd
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from scipy import sparse
+from threadpoolctl import threadpool_limits
+import numpy as np
+import hashlib
 import pickle
+import json
+import os
+import time
+import warnings
 import yaml
 
-def load_data(url: str) -> tuple:
+from src.data.data_io import iter_matrix, matrix_shape, read_matrix
 
-    # Load data:
+def load_data(file_path: str, name: str) -> tuple:
+
+    # Load CSR features and labels:
     try:
-      data = pd.read_csv(url)
+      x_train, y_train = read_matrix(file_path, name)
     except FileNotFoundError:
         print("File does not exist.")
         raise
@@ -16,20 +26,13 @@ def load_data(url: str) -> tuple:
         print(e)
         raise
 
-    # Split data:
-    x_train = data.iloc[:, :-1]
-    y_train = data.iloc[:, -1]
-
     return x_train, y_train
 
-def model_building(x_train: pd.DataFrame, y_train: pd.Series):
+def load_params(url: str) -> dict:
 
-    # Apply Gradient Boosting
-    url = "params.yaml"
     try:
-        dict = yaml.safe_load(open(url, "r"))
-        c = dict["model_building"]["c"]
-        max_iter = dict["model_building"]["max_iter"]
+        with open(url, "r") as file:
+            params = yaml.safe_load(file)["model_building"]
     except FileNotFoundError as e:
         print("The file you are try to fetch, doesn't exist.")
         raise
@@ -42,27 +45,201 @@ def model_building(x_train: pd.DataFrame, y_train: pd.Series):
         print(e)
         raise
     else:
-        lr = LogisticRegression(C=c, max_iter=max_iter)
+        return params
+
+def resolve_n_jobs(n_jobs) -> int:
+    # Same meaning as sklearn/joblib: None is one process, -1 every core,
+    # -2 every core but one, and so on:
+    if n_jobs is None:
+        return 1
+    if n_jobs == 0:
+        raise ValueError("n_jobs can't be 0, use a positive count or -1 for every core.")
+    if n_jobs < 0:
+        return max((os.cpu_count() or 1) + 1 + n_jobs, 1)
+    return n_jobs
+
+def model_building(x_train: sparse.csr_matrix, y_train: np.ndarray, params: dict) -> tuple:
+
+    lr = LogisticRegression(C=params["c"], max_iter=params["max_iter"],
+                            solver=params.get("solver", "lbfgs"), tol=params.get("tol", 1e-4),
+                            n_jobs=params.get("n_jobs"))
+
+    # Cap BLAS/OpenMP threads like n_jobs caps processes, nothing leaves
+    # them uncapped:
+    n_jobs = params.get("n_jobs")
+    limits = None if n_jobs is None else resolve_n_jobs(n_jobs)
+
+    with threadpool_limits(limits=limits), warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", ConvergenceWarning)
+        start = time.perf_counter()
         lr.fit(x_train, y_train)
+        fit_time = time.perf_counter() - start
+
+    n_iter = int(np.max(lr.n_iter_))
+    converged = not any(issubclass(w.category, ConvergenceWarning) for w in caught)
+
+    training = {
+        "mode": "batch",
+        "solver": lr.solver,
+        "n_jobs": n_jobs,
+        "n_samples": x_train.shape[0],
+        "n_features": x_train.shape[1],
+        "nnz": int(x_train.nnz) if sparse.issparse(x_train) else int(np.count_nonzero(x_train)),
+        "fit_time": fit_time,
+        "n_iter": n_iter,
+        "max_iter": lr.max_iter,
+        "converged": converged
+    }
+    if not converged:
+        print(f"{lr.solver} did not converge in {n_iter} iterations, consider raising max_iter.")
+
+    return lr, training
+
+def load_streaming(url: str) -> bool:
+    with open(url, "r") as file:
+        return yaml.safe_load(file)["data_ingestion"].get("streaming", False)
+
+def load_features(url: str) -> dict:
+    with open(url, "r") as file:
+        return yaml.safe_load(file)["feature_engineering"]
+
+def check_resumable(features: dict) -> None:
+    # bow refits its vocabulary and tfidf its IDF weights on every run, so
+    # new data always changes the feature space under the checkpoint:
+    mode = features.get("mode", "bow")
+    if mode != "hashing":
+        raise ValueError(f"Resuming needs feature_engineering.mode: hashing, {mode} refits "
+                         "its vocabulary whenever new data arrives.")
+    if features.get("tfidf", False):
+        raise ValueError("Resuming needs feature_engineering.tfidf: false, the IDF weights "
+                         "are refit whenever new data arrives.")
+
+def feature_fingerprint(file_path: str, vectorizer_url: str = "models/vectorizer.pkl") -> str:
+    # A refit vocabulary keeps the column count but moves words between
+    # columns, so hash the vocabulary (or, for hashed features, the vectorizer):
+    url = os.path.join(file_path, "vocabulary.json")
+    if not os.path.exists(url):
+        url = vectorizer_url
+    with open(url, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+def load_checkpoint(url: str) -> dict:
+    with open(url, "rb") as file:
+        return pickle.load(file)
 
-    return lr
+def save_checkpoint(url: str, state: dict) -> None:
+    # Write next to the old checkpoint, then swap, so a crash never leaves half a file:
+    os.makedirs(os.path.dirname(url) or ".", exist_ok=True)
+    with open(url + ".tmp", "wb") as file:
+        pickle.dump(state, file)
+    os.replace(url + ".tmp", url)
+
+def incremental_building(file_path: str, name: str, params: dict, append_only: bool = False,
+                         vectorizer_url: str = "models/vectorizer.pkl", features: dict = None) -> tuple:
+    incremental = params["incremental"]
+    batch_size, epochs = incremental["batch_size"], incremental["epochs"]
+    checkpoint_url = incremental["checkpoint"]
+
+    # rows_seen is an offset into the train rows, only valid while new rows
+    # are appended after the old ones (streaming hash-split ingestion):
+    if incremental.get("resume", False):
+        if not append_only:
+            raise ValueError("Resuming needs data_ingestion.streaming, a reshuffled split "
+                             "doesn't keep the trained rows in front.")
+        if features is not None:
+            check_resumable(features)
+
+    n_rows, n_features = matrix_shape(file_path, name)
+    classes = np.unique(np.load(os.path.join(file_path, name + "_labels.npy"), mmap_mode="r"))
+    fingerprint = feature_fingerprint(file_path, vectorizer_url)
+
+    # Resume from the checkpoint: rows_seen rows are already in the model and
+    # epochs_done epochs of the rows after them are done:
+    state = None
+    if incremental.get("resume", False) and os.path.exists(checkpoint_url):
+        state = load_checkpoint(checkpoint_url)
+    resumed = state is not None
+    if resumed:
+        if state["n_features"] != n_features or state.get("fingerprint") != fingerprint:
+            raise ValueError(f"Checkpoint features don't match the data ({n_features} features); "
+                             "the feature space changed, retrain from scratch.")
+        if state["rows_seen"] > n_rows:
+            raise ValueError(f"Checkpoint has seen {state['rows_seen']} rows, the data has {n_rows}; "
+                             "rows were removed, retrain from scratch.")
+    else:
+        model = SGDClassifier(loss="log_loss", alpha=incremental["alpha"],
+                              learning_rate=incremental.get("learning_rate", "optimal"),
+                              eta0=incremental.get("eta0", 0.0), random_state=incremental.get("random_state", 42))
+        state = {"model": model, "n_features": n_features, "fingerprint": fingerprint,
+                 "rows_seen": 0, "epochs_done": 0}
+
+    model = state["model"]
+    start = state["rows_seen"]
+
+    fit_time = 0.0
+    epochs_run = 0
+    for epoch in range(state["epochs_done"], epochs if start < n_rows else 0):
+        epoch_start = time.perf_counter()
+        for x_batch, y_batch in iter_matrix(file_path, name, batch_size, start=start):
+            model.partial_fit(x_batch, y_batch, classes=classes)
+        fit_time += time.perf_counter() - epoch_start
+        epochs_run += 1
+
+        state["epochs_done"] = epoch + 1
+        save_checkpoint(checkpoint_url, state)
+        print(f"Epoch {epoch + 1}/{epochs} over rows {start}:{n_rows} done, checkpoint saved.")
+
+    state["rows_seen"], state["epochs_done"] = n_rows, 0
+    save_checkpoint(checkpoint_url, state)
+
+    training = {
+        "mode": "incremental",
+        "resumed": resumed,
+        "n_samples": n_rows,
+        "n_features": n_features,
+        "rows_trained": n_rows - start,
+        "batch_size": batch_size,
+        "epochs": epochs,
+        "fit_time": fit_time,
+        "n_iter": epochs_run,
+        "converged": None
+    }
+
+    return model, training
 
 def save_model(url: str, model: LogisticRegression) -> None:
     with open(url, "wb") as file:
         pickle.dump(model, file)
 
+def save_training(url: str, training: dict) -> None:
+    os.makedirs(os.path.dirname(url), exist_ok=True)
+    with open(url, "w") as file:
+        json.dump(training, file, indent=4)
+
 def main():
 
-    # Ingestion:
-    url = "data/processed/train_bow.csv"
-    x_train, y_train = load_data(url)
+    params = load_params("params.yaml")
 
-    # Train gradient boosting classifier:
-    model = model_building(x_train, y_train)
+    if params.get("mode", "batch") == "incremental":
+        # Stream CSR batches through SGD, resuming from the checkpoint:
+        model, training = incremental_building("data/processed", "train_bow", params,
+                                               append_only=load_streaming("params.yaml"),
+                                               features=load_features("params.yaml"))
+        print(f"Trained {training['rows_trained']} new rows of {training['n_samples']} "
+              f"in {training['fit_time']:.2f}s (resumed: {training['resumed']})")
+    else:
+        # Train logistic regression straight on the CSR matrix:
+        x_train, y_train = load_data("data/processed", "train_bow")
+        model, training = model_building(x_train, y_train, params)
+        print(f"Fit {training['n_samples']}x{training['n_features']} in {training['fit_time']:.2f}s "
+              f"({training['n_iter']} iterations, converged: {training['converged']})")
+
+        # A batch fit starts incremental training over, nothing to resume:
+        save_checkpoint(params["incremental"]["checkpoint"], None)
 
-    # Export model:
+    # Export model and fit statistics:
     save_model("models/model.pkl", model)
+    save_training("reports/training.json", training)
 
 if __name__ == "__main__":
     main()
-
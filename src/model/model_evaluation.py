@@ -2,45 +2,44 @@ import yaml
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, precision_score, recall_score, roc_auc_score
 import pandas as pd
+import numpy as np
+from scipy import sparse
+import hashlib
 import pickle
 import json
-import mlflow
-import mlflow.sklearn
-import dagshub
 import os
 
-dagshub_token = os.getenv("DAGSHUB_PAT")
-if not dagshub_token:
-    raise EnvironmentError("DAGSHUB_PAT environment variable is not set.")
+from src.data.data_io import read_matrix, read_vocabulary
 
-os.environ["MLFLOW_TRACKING_USERNAME"] = dagshub_token
-os.environ["MLFLOW_TRACKING_PASSWORD"] = dagshub_token
+def connect_tracking() -> None:
+    dagshub_token = os.getenv("DAGSHUB_PAT")
+    if not dagshub_token:
+        raise EnvironmentError("DAGSHUB_PAT environment variable is not set.")
 
-dagshub_url = "https://dagshub.com"
-repo_owner = "PriyanshuMewal"
-repo_name = 'mini-project'
+    os.environ["MLFLOW_TRACKING_USERNAME"] = dagshub_token
+    os.environ["MLFLOW_TRACKING_PASSWORD"] = dagshub_token
 
-mlflow.set_tracking_uri(f"{dagshub_url}/{repo_owner}/{repo_name}.mlflow")
+    dagshub_url = "https://dagshub.com"
+    repo_owner = "PriyanshuMewal"
+    repo_name = 'mini-project'
 
-mlflow.set_experiment("dvc-pipeline")
+    import mlflow
+    mlflow.set_tracking_uri(f"{dagshub_url}/{repo_owner}/{repo_name}.mlflow")
 
-def load_data(url: str) -> tuple:
+    mlflow.set_experiment("dvc-pipeline")
 
-    # Load data:
+def load_data(file_path: str, name: str) -> tuple:
+
+    # Load CSR features and labels:
     try:
-        data = pd.read_csv(url)
+        x_test, y_test = read_matrix(file_path, name)
     except FileNotFoundError:
-        print(f"At {url} file doesn't exist.")
         raise
     except Exception as e:
         print("An unexpected error occurred.")
         print(e)
         raise
 
-    # Split data:
-    x_test = data.iloc[:, :-1]
-    y_test = data.iloc[:, -1]
-
     # Load model:
     model_url = "models/model.pkl"
     try:
@@ -60,7 +59,7 @@ def load_data(url: str) -> tuple:
     else:
         return x_test, y_test, model
 
-def evaluate_model(x_test: pd.DataFrame, y_test: pd.Series, model: LogisticRegression) -> dict:
+def evaluate_model(x_test: sparse.csr_matrix, y_test: np.ndarray, model: LogisticRegression) -> dict:
 
     # Predictions and Evaluation
     y_pred = model.predict(x_test)
@@ -95,17 +94,9 @@ def save_model_version(model_name, version, url):
     with open(url, "w") as file:
         json.dump(model_info, file, indent=4)
 
-def main():
-
-    # Ingest data:
-    url = "data/processed/test_bow.csv"
-    x_test, y_test, model = load_data(url)
-
-    # Evaluate model:
-    metrics = evaluate_model(x_test, y_test, model)
-
-    # Save metrics:
-    save_metrics("reports/metrics.json", metrics)
+def log_run(metrics: dict, model: LogisticRegression, x_test: sparse.csr_matrix) -> None:
+    import mlflow
+    import mlflow.sklearn
 
     with mlflow.start_run() as run:
 
@@ -116,9 +107,23 @@ def main():
         mlflow.log_params(params["feature_engineering"])
         mlflow.log_params(params["model_building"])
 
+        # Fit statistics recorded by model_building:
+        if os.path.exists("reports/training.json"):
+            with open("reports/training.json", "r") as file:
+                training = json.load(file)
+            mlflow.log_metrics({"fit_time": training["fit_time"], "n_iter": training["n_iter"]})
+            # Incremental SGD has no convergence check to report:
+            if training["converged"] is not None:
+                mlflow.set_tag("converged", training["converged"])
+
         model_name = "Logistic_Regression"
         registered_model_name = "emotion_detection"
-        signature = mlflow.models.infer_signature(x_test, model.predict(x_test))
+        # The served model still takes one named column per feature,
+        # hashed features are too wide for that and stay sparse:
+        x_sample = x_test[:5]
+        if os.path.exists("data/processed/vocabulary.json"):
+            x_sample = pd.DataFrame(x_sample.toarray(), columns=read_vocabulary("data/processed"))
+        signature = mlflow.models.infer_signature(x_sample, model.predict(x_test[:5]))
         model_info = mlflow.sklearn.log_model(model, artifact_path=model_name, signature=signature,
                                  registered_model_name=registered_model_name)
 
@@ -126,6 +131,32 @@ def main():
         url = "reports/model_info.json"
         save_model_version(registered_model_name, version, url)
 
+        # Serving pairs the model with the vectorizer it was trained with,
+        # log it with the run and record its hash on the version:
+        vectorizer_url = "models/vectorizer.pkl"
+        mlflow.log_artifact(vectorizer_url, artifact_path="vectorizer")
+        with open(vectorizer_url, "rb") as file:
+            vectorizer_sha256 = hashlib.sha256(file.read()).hexdigest()
+        mlflow.MlflowClient().set_model_version_tag(registered_model_name, version, "vectorizer_sha256",
+                                                    vectorizer_sha256)
+
+def main():
+
+    # Fail before evaluating if the run can't be logged:
+    connect_tracking()
+
+    # Ingest data:
+    x_test, y_test, model = load_data("data/processed", "test_bow")
+
+    # Evaluate model:
+    metrics = evaluate_model(x_test, y_test, model)
+
+    # Save metrics:
+    save_metrics("reports/metrics.json", metrics)
+
+    # Log the run and register the model on DagsHub:
+    log_run(metrics, model, x_test)
+
 if __name__ == "__main__":
     main()
 
@@ -0,0 +1,152 @@
+import argparse
+import io
+import os
+import shutil
+import subprocess
+import time
+
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from src.data import data_ingestion, data_preprocessing
+from src.data.data_io import load_format, read_frame
+from src.data.download_cache import DownloadCache
+from src.features import feature_engineering
+from src.model import model_building, model_evaluation
+
+# Outputs DVC removes before it reruns the stages, see dvc.yaml:
+OUTPUTS = [os.path.join("data", "raw"), os.path.join("data", "interim"), os.path.join("data", "processed")]
+
+def as_stored(df: pd.DataFrame, fmt: str) -> pd.DataFrame:
+    # The frame the next stage would read back from disk: a fresh index,
+    # and for csv whatever read_csv makes of it (empty strings and texts
+    # like "nan" or "null" come back as NaN), so round-trip it in memory:
+    df = df.reset_index(drop=True)
+    if fmt == "csv":
+        df = pd.read_csv(io.StringIO(df.to_csv(index=False)))
+    return df
+
+def clean_outputs() -> None:
+    for file_path in OUTPUTS:
+        shutil.rmtree(file_path, ignore_errors=True)
+
+def ingest(fmt: str) -> tuple:
+    params = data_ingestion.load_params("params.yaml")
+
+    cache = DownloadCache(params["cache_dir"], offline=params["offline"],
+                          max_age=params["cache_max_age"])
+    url = cache.fetch(params["source"])
+
+    if params["streaming"]:
+        # Out of core by design, read the split back once it's written:
+        data_ingestion.stream_data(url, params["test_size"], params["chunk_size"], fmt=fmt)
+        return read_frame("data/raw", "train", fmt), read_frame("data/raw", "test", fmt)
+
+    df = data_ingestion.basic_preprocessing(data_ingestion.read_data(url))
+    train_data, test_data = train_test_split(df, test_size=params["test_size"], random_state=42)
+    data_ingestion.dump_data(train_data, test_data, fmt)
+
+    return as_stored(train_data, fmt), as_stored(test_data, fmt)
+
+def preprocess(train_data: pd.DataFrame, test_data: pd.DataFrame, fmt: str) -> tuple:
+    params = data_preprocessing.load_params("params.yaml")
+
+    train_data, test_data = data_preprocessing.normalize_frames(train_data, test_data, params)
+    data_preprocessing.dump_data(train_data, test_data, fmt)
+
+    # feature_engineering drops the rows normalization emptied:
+    train_data, test_data = as_stored(train_data, fmt), as_stored(test_data, fmt)
+    return train_data.dropna(), test_data.dropna()
+
+def featurize(train_data: pd.DataFrame, test_data: pd.DataFrame) -> tuple:
+    params = feature_engineering.load_params("params.yaml")
+
+    train_bow, test_bow, vocabulary, vectorizer = feature_engineering.vectorize(train_data, test_data, params)
+    feature_engineering.save_trf(vectorizer)
+    feature_engineering.dump_data(train_bow, test_bow, vocabulary)
+
+    return train_bow, test_bow
+
+def train(train_bow: tuple):
+    params = model_building.load_params("params.yaml")
+
+    if params.get("mode", "batch") == "incremental":
+        model, training = model_building.incremental_building(
+            "data/processed", "train_bow", params, append_only=model_building.load_streaming("params.yaml"),
+            features=model_building.load_features("params.yaml"))
+    else:
+        model, training = model_building.model_building(*train_bow, params)
+        model_building.save_checkpoint(params["incremental"]["checkpoint"], None)
+
+    model_building.save_model("models/model.pkl", model)
+    model_building.save_training("reports/training.json", training)
+
+    return model
+
+def evaluate(test_bow: tuple, model, tracking: bool = True) -> dict:
+    x_test, y_test = test_bow
+
+    metrics = model_evaluation.evaluate_model(x_test, y_test, model)
+    model_evaluation.save_metrics("reports/metrics.json", metrics)
+
+    if tracking:
+        model_evaluation.log_run(metrics, model, x_test)
+
+    return metrics
+
+def run(tracking: bool = True) -> dict:
+
+    # Same checks as the evaluation and model_building stages, before any
+    # work is done:
+    if tracking:
+        model_evaluation.connect_tracking()
+    params = model_building.load_params("params.yaml")
+    if params.get("mode", "batch") == "incremental" and params["incremental"].get("resume", False):
+        model_building.check_resumable(model_building.load_features("params.yaml"))
+
+    fmt = load_format("params.yaml")
+    clean_outputs()
+
+    timings = {}
+    start = time.perf_counter()
+
+    def lap(stage: str) -> None:
+        nonlocal start
+        timings[stage] = time.perf_counter() - start
+        start = time.perf_counter()
+
+    # Every stage still writes its DVC outputs, the next one takes the
+    # frames and matrices from memory instead of reading them back:
+    train_data, test_data = ingest(fmt)
+    lap("data_ingestion")
+    train_data, test_data = preprocess(train_data, test_data, fmt)
+    lap("data_preprocessing")
+    train_bow, test_bow = featurize(train_data, test_data)
+    lap("feature_engineering")
+    model = train(train_bow)
+    lap("model_building")
+    metrics = evaluate(test_bow, model, tracking)
+    lap("model_evaluation")
+
+    return {"timings": timings, "metrics": metrics}
+
+def main():
+    parser = argparse.ArgumentParser(description="Run ingestion through evaluation in one process.")
+    parser.add_argument("--no-tracking", action="store_true",
+                        help="Write reports/metrics.json but don't log the run to MLflow.")
+    parser.add_argument("--dvc-commit", action="store_true",
+                        help="Record the new outputs in dvc.lock afterwards.")
+    args = parser.parse_args()
+
+    result = run(tracking=not args.no_tracking)
+
+    for stage, seconds in result["timings"].items():
+        print(f"{stage:22}{seconds:>8.2f}s")
+    print(f"{'total':22}{sum(result['timings'].values()):>8.2f}s")
+    print(result["metrics"])
+
+    if args.dvc_commit:
+        subprocess.run(["dvc", "commit", "--force"], check=True)
+
+if __name__ == "__main__":
+    main()
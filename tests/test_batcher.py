@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import unittest
+
+from Fastapi.batcher import MicroBatcher
+
+
+class RecordingScorer:
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, texts: list) -> tuple:
+        self.batches.append(list(texts))
+        return [len(text) for text in texts], [len(text) / 10 for text in texts]
+
+
+class TestMicroBatcher(unittest.IsolatedAsyncioTestCase):
+
+    async def test_coalesces_concurrent_requests(self):
+        scorer = RecordingScorer()
+        batcher = MicroBatcher(scorer, max_batch_size=64, max_wait_ms=50)
+        texts = ["a" * i for i in range(1, 21)]
+
+        results = await asyncio.gather(*(batcher.submit(text) for text in texts))
+        await batcher.stop()
+
+        # Every caller gets its own result, scored in far fewer calls:
+        self.assertEqual([label for label, _ in results], list(range(1, 21)))
+        self.assertEqual(sum(len(batch) for batch in scorer.batches), 20)
+        self.assertLess(len(scorer.batches), 20)
+
+    async def test_respects_max_batch_size(self):
+        scorer = RecordingScorer()
+        batcher = MicroBatcher(scorer, max_batch_size=4, max_wait_ms=50)
+
+        await asyncio.gather(*(batcher.submit("text") for _ in range(10)))
+        await batcher.stop()
+
+        self.assertTrue(all(len(batch) <= 4 for batch in scorer.batches))
+        self.assertGreaterEqual(len(scorer.batches), 3)
+
+    async def test_propagates_errors(self):
+        def failing(texts):
+            raise RuntimeError("model unavailable")
+
+        batcher = MicroBatcher(failing, max_wait_ms=1)
+        with self.assertRaises(RuntimeError):
+            await batcher.submit("text")
+
+        # The worker survives a failed batch:
+        batcher.score_fn = RecordingScorer()
+        self.assertEqual(await batcher.submit("abc"), (3, 0.3))
+        await batcher.stop()
+
+    async def test_stop_fails_pending_requests(self):
+        started, release = threading.Event(), threading.Event()
+
+        def slow(texts):
+            started.set()
+            release.wait(5)
+            return [0] * len(texts), [0.0] * len(texts)
+
+        batcher = MicroBatcher(slow, max_batch_size=2, max_wait_ms=1)
+        tasks = [asyncio.create_task(batcher.submit(f"text {i}")) for i in range(4)]
+        await asyncio.to_thread(started.wait, 5)
+
+        # One batch is being scored, the other still queued:
+        await batcher.stop()
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+    async def test_stop_while_collecting(self):
+        batcher = MicroBatcher(lambda texts: ([0] * len(texts), [0.0] * len(texts)), max_wait_ms=200)
+        task = asyncio.create_task(batcher.submit("lonely text"))
+        await asyncio.sleep(0.02)
+
+        # The request is dequeued, waiting for company:
+        await batcher.stop()
+        with self.assertRaises(RuntimeError):
+            await asyncio.wait_for(task, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
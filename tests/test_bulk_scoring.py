@@ -0,0 +1,85 @@
+import io
+import itertools
+import json
+import unittest
+
+import numpy as np
+
+from Fastapi.bulk_scoring import Throughput, score_stream
+
+
+def score(texts: list) -> tuple:
+    # Label 1 for texts mentioning "happy", probability from the length:
+    labels = np.array(["happy" in text for text in texts], dtype=int)
+    return labels, np.array([len(text) / 100 for text in texts])
+
+
+class TestScoreStream(unittest.TestCase):
+
+    def test_ndjson_in_batches(self):
+        lines = [json.dumps({"id": f"t{i}", "text": text}) + "\n"
+                 for i, text in enumerate(["HAPPY day", "sad", "happy", "", "rain"])]
+        throughput = Throughput()
+
+        chunks = list(score_stream(lines, score, str.lower, batch_size=2, throughput=throughput))
+        results = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual([r["id"] for r in results], ["t0", "t1", "t2", "t3", "t4"])
+        self.assertEqual([r["label"] for r in results], [1, 0, 1, 0, 0])
+        self.assertEqual(throughput.summary()["rows"], 5)
+
+    def test_csv_with_multiline_field(self):
+        source = io.StringIO('text\nhappy\n"sad,\nday"\nhappy again\n')
+
+        output = "".join(score_stream(source, score, str.lower, fmt="csv", batch_size=2))
+
+        # One header for the whole stream, row numbers stand in for missing ids:
+        self.assertEqual(output.splitlines(), ["id,label,probability,error", "1,1,0.05,", "2,0,0.08,", "3,1,0.11,"])
+
+    def test_input_is_read_lazily(self):
+        lines = (json.dumps({"text": f"happy {i}"}) for i in itertools.count())
+
+        first = next(score_stream(lines, score, str.lower, batch_size=10))
+        self.assertEqual(len(first.splitlines()), 10)
+
+    def test_bad_rows_are_reported_in_place(self):
+        lines = ['{"id": "a", "text": "happy"}\n', '{"id": "b", "text": \n', '{"id": "c"}\n', '[1, 2]\n',
+                 '{"id": "e", "text": "sad"}\n']
+        throughput = Throughput()
+
+        output = "".join(score_stream(lines, score, str.lower, batch_size=2, throughput=throughput))
+        results = [json.loads(line) for line in output.splitlines()]
+
+        # Line numbers stand in for missing ids, the same ones the errors cite:
+        self.assertEqual([r["id"] for r in results], ["a", 2, "c", 4, "e"])
+        self.assertEqual([r.get("label") for r in results], [1, None, None, None, 0])
+        self.assertIn("line 2: invalid JSON", results[1]["error"])
+        self.assertIn("missing text field", results[2]["error"])
+        self.assertEqual(throughput.summary()["errors"], 3)
+
+    def test_undecodable_bytes_are_reported_in_place(self):
+        lines = io.BytesIO(b'{"id": "a", "text": "happy"}\n{"id": "b", "text": "\xff\xfe"}\n{"id": "c", "text": "sad"}\n')
+
+        output = "".join(score_stream(lines, score, str.lower))
+        results = [json.loads(line) for line in output.splitlines()]
+
+        self.assertEqual([r.get("label") for r in results], [1, None, 0])
+        self.assertIn("line 2: invalid UTF-8", results[1]["error"])
+
+        # CSV records can span lines, bad bytes are replaced instead:
+        output = "".join(score_stream(io.BytesIO(b"text\nhappy \xff\n"), score, str.lower, fmt="csv"))
+        self.assertEqual(output.splitlines()[1].split(",")[1], "1")
+
+    def test_rejects_batch_size_below_one(self):
+        for batch_size in (0, -1):
+            with self.assertRaises(ValueError):
+                next(score_stream(['{"text": "happy"}'], score, str.lower, batch_size=batch_size))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            list(score_stream(["text"], score, str.lower, fmt="xml"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+import warnings
+
+import pandas as pd
+
+from src.data import data_ingestion
+
+
+class TestStreamData(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        sentiments = ["sadness", "happiness", "worry", "neutral"]
+        rows = [(i, sentiments[i % 4], f"tweet number {i % 300}") for i in range(2000)]
+        self.source = pd.DataFrame(rows, columns=["tweet_id", "sentiment", "content"])
+
+        self.url = os.path.join(self.tmp.name, "emotion_dataset.csv")
+        self.source.to_csv(self.url, index=False)
+
+    def stream(self, name: str, chunk_size: int) -> tuple:
+        file_path = os.path.join(self.tmp.name, name)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            data_ingestion.stream_data(self.url, 0.4, chunk_size, file_path)
+
+        train = pd.read_csv(os.path.join(file_path, "train.csv"))
+        test = pd.read_csv(os.path.join(file_path, "test.csv"))
+        return train, test
+
+    def test_matches_in_memory_preprocessing(self):
+        train, test = self.stream("raw", chunk_size=128)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            expected = data_ingestion.basic_preprocessing(self.source.copy())
+
+        streamed = pd.concat([train, test])
+        self.assertEqual(len(streamed), len(expected))
+        self.assertFalse(streamed.duplicated().any())
+        self.assertEqual(set(streamed.sentiment), {0, 1})
+        self.assertEqual(list(train.columns), ["sentiment", "content"])
+
+        # Roughly test_size of the unique rows end up in test:
+        self.assertAlmostEqual(len(test) / len(streamed), 0.4, delta=0.1)
+
+    def test_split_is_independent_of_chunk_size(self):
+        train_a, test_a = self.stream("a", chunk_size=64)
+        train_b, test_b = self.stream("b", chunk_size=1000)
+
+        pd.testing.assert_frame_equal(train_a, train_b)
+        pd.testing.assert_frame_equal(test_a, test_b)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from src.data.data_io import (ChunkWriter, iter_matrix, matrix_shape, read_frame, read_matrix,
+                              read_vocabulary, write_frame, write_matrix, write_vocabulary)
+
+
+class TestDataIO(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.file_path = tmp.name
+
+    def test_round_trip(self):
+        df = pd.DataFrame({"sentiment": [0, 1, 1], "content": ["sad day", "happy", "great"]})
+
+        for fmt in ["csv", "parquet"]:
+            with self.subTest(fmt=fmt):
+                write_frame(df, self.file_path, "train", fmt)
+                pd.testing.assert_frame_equal(read_frame(self.file_path, "train", fmt), df)
+
+    def test_sparse_frame_to_parquet(self):
+        matrix = sparse.csr_matrix([[0, 2], [1, 0]])
+        df = pd.DataFrame.sparse.from_spmatrix(matrix, columns=["happy", "sad"])
+        df["sentiment"] = [1, 0]
+
+        write_frame(df, self.file_path, "train_bow", "parquet")
+        result = read_frame(self.file_path, "train_bow", "parquet")
+
+        self.assertEqual(result.values.tolist(), [[0, 2, 1], [1, 0, 0]])
+
+    def test_matrix_round_trip(self):
+        matrix = sparse.csr_matrix([[0, 2, 0], [1, 0, 3]])
+
+        write_matrix(matrix, [1, 0], self.file_path, "train_bow")
+        write_vocabulary(["day", "happy", "sad"], self.file_path)
+        x, y = read_matrix(self.file_path, "train_bow")
+
+        self.assertTrue(sparse.isspmatrix_csr(x))
+        self.assertEqual((x != matrix).nnz, 0)
+        self.assertEqual(y.tolist(), [1, 0])
+        self.assertEqual(read_vocabulary(self.file_path), ["day", "happy", "sad"])
+
+    def test_iter_matrix(self):
+        matrix = sparse.random(103, 20, density=0.2, format="csr", random_state=0)
+        labels = np.arange(103) % 2
+        write_matrix(matrix, labels, self.file_path, "train_bow")
+
+        for start in [0, 25]:
+            with self.subTest(start=start):
+                batches = list(iter_matrix(self.file_path, "train_bow", batch_size=10, start=start))
+                x = sparse.vstack([x for x, _ in batches])
+                y = np.concatenate([y for _, y in batches])
+
+                self.assertEqual(batches[0][0].shape, (10, 20))
+                self.assertEqual((x != matrix[start:]).nnz, 0)
+                self.assertEqual(y.tolist(), labels[start:].tolist())
+
+        self.assertEqual(matrix_shape(self.file_path, "train_bow"), (103, 20))
+
+    def test_chunk_writer(self):
+        chunks = [pd.DataFrame({"sentiment": [0, 1], "content": ["a", "b"]}),
+                  pd.DataFrame({"sentiment": [], "content": []}),
+                  pd.DataFrame({"sentiment": [1], "content": ["c"]})]
+
+        for fmt in ["csv", "parquet"]:
+            with self.subTest(fmt=fmt):
+                with ChunkWriter(self.file_path, fmt, fmt) as writer:
+                    for chunk in chunks:
+                        writer.write(chunk)
+
+                result = read_frame(self.file_path, fmt, fmt)
+                self.assertEqual(result.content.tolist(), ["a", "b", "c"])
+                self.assertEqual(result.sentiment.tolist(), [0, 1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import contextlib
+import functools
+import io
+import os
+import tempfile
+import threading
+import unittest
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+
+from src.data.download_cache import DownloadCache
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+
+    truncate = False
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if not self.truncate:
+            return super().do_GET()
+
+        # Promise more than is sent, then drop the connection:
+        self.send_response(200)
+        self.send_header("Content-Length", "1000")
+        self.end_headers()
+        self.wfile.write(b"tweet_id,sentiment")
+
+
+class TestDownloadCache(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+
+        self.serve_dir = os.path.join(tmp.name, "serve")
+        self.cache_dir = os.path.join(tmp.name, "cache")
+        os.makedirs(self.serve_dir)
+        self.write_source("tweet_id,sentiment,content\n1,happiness,hello\n")
+
+        QuietHandler.truncate = False
+        handler = functools.partial(QuietHandler, directory=self.serve_dir)
+        self.server = HTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.url = f"http://127.0.0.1:{self.server.server_port}/emotion_dataset.csv"
+
+    def write_source(self, content: str) -> None:
+        with open(os.path.join(self.serve_dir, "emotion_dataset.csv"), "w") as file:
+            file.write(content)
+
+    def fetch(self, **kwargs) -> tuple:
+        cache = DownloadCache(self.cache_dir, **kwargs)
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            url = cache.fetch(self.url)
+        return url, out.getvalue()
+
+    def test_miss_then_hit(self):
+        first, log = self.fetch()
+        self.assertIn("cache miss", log)
+        self.assertTrue(first.startswith(self.cache_dir))
+
+        # A fresh entry is served without touching the server:
+        self.server.shutdown()
+        second, log = self.fetch()
+        self.assertIn("cache hit", log)
+        self.assertEqual(first, second)
+
+    def test_revalidates_by_content_hash(self):
+        first, _ = self.fetch()
+
+        _, log = self.fetch(max_age=0)
+        self.assertIn("content unchanged", log)
+
+        self.write_source("tweet_id,sentiment,content\n2,sadness,bye\n")
+        changed, log = self.fetch(max_age=0)
+        self.assertIn("cache miss", log)
+        self.assertNotEqual(first, changed)
+
+    def test_offline(self):
+        with self.assertRaises(FileNotFoundError):
+            self.fetch(offline=True)
+
+        first, _ = self.fetch()
+        self.server.shutdown()
+
+        second, log = self.fetch(offline=True)
+        self.assertIn("offline", log)
+        self.assertEqual(first, second)
+
+    def test_falls_back_to_cache_when_download_fails(self):
+        first, _ = self.fetch()
+        self.server.shutdown()
+        self.server.server_close()
+
+        second, log = self.fetch(max_age=0, timeout=1)
+        self.assertIn("Download failed", log)
+        self.assertEqual(first, second)
+
+    def test_falls_back_to_cache_when_body_is_cut_off(self):
+        first, _ = self.fetch()
+        QuietHandler.truncate = True
+
+        second, log = self.fetch(max_age=0, timeout=1)
+        self.assertIn("Download failed", log)
+        self.assertEqual(first, second)
+
+        # The partial temp file is gone:
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), sorted([os.path.basename(first), "index.json"]))
+
+    def test_local_source(self):
+        url = os.path.join(self.serve_dir, "emotion_dataset.csv")
+        cache = DownloadCache(self.cache_dir)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(cache.fetch(url), url)
+            self.assertEqual(cache.fetch("file://" + url), url)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
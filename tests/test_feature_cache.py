@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from src.features.feature_cache import FeatureCache, make_key, normalize_cached, vectorize_cached
+from src.features.feature_engineering import vectorize
+from test_text_normalizer import has_corpora
+
+FEATURES = {"mode": "bow", "max_features": 20, "n_jobs": 1, "chunk_size": 10000}
+PREPROCESSING = {"vectorized": False, "n_jobs": 1, "chunk_size": 10000, "lemma_cache_size": 1000}
+
+
+def frames() -> tuple:
+    train = pd.DataFrame({"content": ["i love the sunshine", "worst day ever", "missing my friends",
+                                      "so happy today"], "sentiment": [1, 0, 0, 1]})
+    test = pd.DataFrame({"content": ["love my friends", "sad day"], "sentiment": [1, 0]})
+    return train, test
+
+
+class TestFeatureCache(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = FeatureCache(os.path.join(tmp.name, "features"))
+
+    def test_key_follows_content_and_options(self):
+        train, test = frames()
+        key = make_key("features", train, test, FEATURES)
+
+        self.assertEqual(key, make_key("features", train.copy(), test.copy(), dict(FEATURES)))
+        self.assertNotEqual(key, make_key("features", train, test, dict(FEATURES, max_features=10)))
+        self.assertNotEqual(key, make_key("normalized", train, test, FEATURES))
+
+        changed = train.copy()
+        changed.loc[0, "content"] = "i hate the sunshine"
+        self.assertNotEqual(key, make_key("features", changed, test, FEATURES))
+
+    def test_round_trip(self):
+        train, _ = frames()
+        artifacts = {"frame": train, "matrix": sparse.random(5, 4, density=0.5, format="csr"),
+                     "labels": np.array([0, 1, 1]), "vocabulary": np.array(["a", "b"], dtype=object)}
+        self.cache.store("key", artifacts)
+        loaded = self.cache.load("key")
+
+        pd.testing.assert_frame_equal(loaded["frame"], train)
+        self.assertEqual((loaded["matrix"] != artifacts["matrix"]).nnz, 0)
+        np.testing.assert_array_equal(loaded["labels"], artifacts["labels"])
+        np.testing.assert_array_equal(loaded["vocabulary"], artifacts["vocabulary"])
+        self.assertIsNone(self.cache.load("missing"))
+
+    def test_evicts_least_recently_used(self):
+        payload = {"labels": np.zeros(1000)}
+        self.cache.store("a", payload)
+        size = self.cache.stats()["bytes"]
+        self.cache.max_bytes = 2 * size
+
+        self.cache.store("b", payload)
+        self.cache.load("a")
+        self.cache.store("c", payload)
+
+        # b was used least recently:
+        self.assertEqual(set(self.cache.load_index()), {"a", "c"})
+        self.assertFalse(os.path.exists(self.cache.entry_path("b")))
+
+    def test_vectorize_cached_skips_recompute(self):
+        train, test = frames()
+        first = vectorize_cached(train, test, FEATURES, self.cache)
+
+        with mock.patch("src.features.feature_engineering.vectorize") as recompute:
+            second = vectorize_cached(train, test, FEATURES, self.cache)
+        recompute.assert_not_called()
+
+        expected = vectorize(train, test, FEATURES)
+        for result in (first, second):
+            self.assertEqual((result[0][0] != expected[0][0]).nnz, 0)
+            np.testing.assert_array_equal(result[1][1], expected[1][1])
+            np.testing.assert_array_equal(result[2], expected[2])
+        self.assertEqual(list(second[3].get_feature_names_out()), list(expected[2]))
+
+    @unittest.skipUnless(has_corpora(), "NLTK stopwords/wordnet corpora are not installed.")
+    def test_normalize_cached_skips_recompute(self):
+        train, test = frames()
+        train.index = [7, 3, 5, 1]
+        first = normalize_cached(train, test, PREPROCESSING, self.cache)
+
+        with mock.patch("src.data.data_preprocessing.normalize_frames") as recompute:
+            second = normalize_cached(train, test, PREPROCESSING, self.cache)
+        recompute.assert_not_called()
+
+        # A hit looks exactly like the miss that stored it:
+        pd.testing.assert_frame_equal(first[0], second[0])
+        pd.testing.assert_frame_equal(first[1], second[1])
+        # The caller's frames are left as they were:
+        self.assertEqual(train.loc[0, "content"], "i love the sunshine")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+
+from sklearn.feature_extraction.text import CountVectorizer
+
+from src.features.feature_engineering import build_vectorizer, make_transform_pool, parallel_transform
+
+DOCS = ["happy day happy", "sad day", "love love love sunshine"]
+
+
+class TestBuildVectorizer(unittest.TestCase):
+
+    def test_bow(self):
+        vectorizer = build_vectorizer({"mode": "bow", "max_features": 2})
+        self.assertIsInstance(vectorizer, CountVectorizer)
+        self.assertEqual(vectorizer.fit_transform(DOCS).shape, (3, 2))
+
+    def test_hashing_counts_match_bow(self):
+        hashed = build_vectorizer({"mode": "hashing", "n_features": 2 ** 16}).fit_transform(DOCS)
+        counts = CountVectorizer().fit_transform(DOCS)
+
+        self.assertEqual(hashed.shape, (3, 2 ** 16))
+        self.assertEqual(sorted(hashed.sum(axis=1).A1), sorted(counts.sum(axis=1).A1))
+
+    def test_hashing_tfidf(self):
+        vectorizer = build_vectorizer({"mode": "hashing", "n_features": 2 ** 10, "tfidf": True})
+        x = vectorizer.fit_transform(DOCS)
+
+        # Rows are l2 normalized by the tfidf stage:
+        self.assertAlmostEqual(float(x.multiply(x).sum(axis=1).A1[0]), 1.0)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            build_vectorizer({"mode": "word2vec"})
+
+
+class TestParallelTransform(unittest.TestCase):
+
+    def setUp(self):
+        self.docs = [f"{DOCS[i % 3]} word{i % 17} word{i % 5}" for i in range(200)]
+
+    def assert_identical(self, left, right):
+        self.assertEqual(left.shape, right.shape)
+        self.assertEqual((left != right).nnz, 0)
+        self.assertTrue((left.indptr == right.indptr).all())
+
+    def test_matches_serial(self):
+        configs = [{"mode": "bow", "max_features": 10},
+                   {"mode": "hashing", "n_features": 2 ** 12},
+                   {"mode": "hashing", "n_features": 2 ** 12, "tfidf": True}]
+
+        for params in configs:
+            with self.subTest(params=params):
+                vectorizer = build_vectorizer(params).fit(self.docs)
+                serial = vectorizer.transform(self.docs)
+                parallel = parallel_transform(vectorizer, self.docs, n_jobs=3, chunk_size=7)
+                self.assert_identical(parallel, serial)
+
+    def test_reuses_caller_pool(self):
+        vectorizer = build_vectorizer({"mode": "bow", "max_features": 10}).fit(self.docs)
+
+        with make_transform_pool(vectorizer, n_jobs=2) as pool:
+            first = parallel_transform(vectorizer, self.docs, chunk_size=50, executor=pool)
+            second = parallel_transform(vectorizer, self.docs[::-1], chunk_size=50, executor=pool)
+
+        self.assert_identical(first, vectorizer.transform(self.docs))
+        self.assert_identical(second, vectorizer.transform(self.docs[::-1]))
+
+    def test_rejects_pool_of_another_vectorizer(self):
+        vectorizer = build_vectorizer({"mode": "bow", "max_features": 10}).fit(self.docs)
+        swapped = build_vectorizer({"mode": "bow", "max_features": 5}).fit(self.docs)
+
+        with make_transform_pool(vectorizer, n_jobs=2) as pool:
+            with self.assertRaises(ValueError):
+                parallel_transform(swapped, self.docs, chunk_size=50, executor=pool)
+
+
+if __name__ == "__main__":
+    unittest.main()
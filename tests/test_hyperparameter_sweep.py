@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer
+
+from src.model.hyperparameter_sweep import build_configs, featurize, run_sweep, save_results, top_features
+
+SWEEP = {"search": "grid", "random_state": 42, "validation_size": 0.25, "metric": "auc", "n_jobs": 2,
+         "grid": {"max_features": [5, 20], "c": [0.1, 1.0]}}
+DEFAULTS = {"max_iter": 150, "solver": "newton-cg", "tol": 1e-4}
+
+
+def synthetic_frame(n_rows: int = 200) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    happy, sad = ["happy", "love", "great", "sunshine"], ["sad", "worst", "missing", "tired"]
+    filler = ["day", "today", "friends", "work", "morning", "home", "week", "night"]
+    rows = []
+    for i in range(n_rows):
+        sentiment = i % 2
+        words = list(rng.choice(happy if sentiment else sad, 2)) + list(rng.choice(filler, 4))
+        rows.append({"content": " ".join(words), "sentiment": sentiment})
+    return pd.DataFrame(rows)
+
+
+class TestHyperparameterSweep(unittest.TestCase):
+
+    def test_grid_and_random_configs(self):
+        self.assertEqual(len(build_configs(SWEEP)), 4)
+
+        configs = build_configs(dict(SWEEP, search="random", n_iter=3))
+        self.assertEqual(len(configs), 3)
+        self.assertEqual(configs, build_configs(dict(SWEEP, search="random", n_iter=3)))
+
+        with self.assertRaises(ValueError):
+            build_configs(dict(SWEEP, search="bayes"))
+
+    def test_top_features_match_max_features(self):
+        docs = synthetic_frame()["content"].values
+        x = CountVectorizer().fit(docs).transform(docs)
+        full = np.array(CountVectorizer().fit(docs).get_feature_names_out())
+
+        limited = CountVectorizer(max_features=5).fit(docs)
+        self.assertEqual(list(full[top_features(x, 5)]), list(limited.get_feature_names_out()))
+
+    def test_featurize_keeps_test_out(self):
+        x_train, y_train, x_val, y_val = featurize(synthetic_frame(), SWEEP)
+
+        self.assertEqual((x_train.shape[0], x_val.shape[0]), (150, 50))
+        self.assertEqual(x_train.shape[1], x_val.shape[1])
+        self.assertEqual(y_train.mean(), 0.5)
+
+    def test_run_sweep_ranks_and_saves(self):
+        table = run_sweep(synthetic_frame(), SWEEP, DEFAULTS)
+
+        self.assertEqual(len(table), 4)
+        self.assertEqual(list(table["rank"]), [1, 2, 3, 4])
+        self.assertTrue(table["auc"].is_monotonic_decreasing)
+        self.assertTrue(set(table["max_features"]) == {5, 20})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            url, best_url = os.path.join(tmp, "sweep.csv"), os.path.join(tmp, "sweep_best.json")
+            best = save_results(table, SWEEP, url, best_url)
+
+            self.assertEqual(len(pd.read_csv(url)), 4)
+            with open(best_url) as file:
+                self.assertEqual(json.load(file), best)
+            self.assertEqual(set(best["params"]), {"max_features", "c"})
+            self.assertEqual(best["auc"], table["auc"].iloc[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+from sklearn.feature_extraction.text import CountVectorizer
+
+from src.data.lemma_cache import LemmaCache
+
+
+class CountingLemmatizer:
+
+    def __init__(self):
+        self.calls = 0
+
+    def lemmatize(self, word: str) -> str:
+        self.calls += 1
+        return word.rstrip("s")
+
+
+class TestLemmaCache(unittest.TestCase):
+
+    def test_hits_and_misses(self):
+        lemmatizer = CountingLemmatizer()
+        cache = LemmaCache(lemmatizer, max_size=10)
+
+        for token in ["cats", "dogs", "cats", "cats"]:
+            cache.lemmatize(token)
+
+        stats = cache.stats()
+        self.assertEqual(lemmatizer.calls, 2)
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_lru_eviction(self):
+        lemmatizer = CountingLemmatizer()
+        cache = LemmaCache(lemmatizer, max_size=2)
+
+        for token in ["a", "b", "a", "c", "b"]:
+            cache.lemmatize(token)
+
+        # "b" was least recently used when "c" came in:
+        stats = cache.stats()
+        self.assertEqual(lemmatizer.calls, 4)
+        self.assertEqual(stats["size"], 2)
+        self.assertEqual(stats["evictions"], 2)
+
+    def test_warm_from_vectorizer(self):
+        vectorizer = CountVectorizer().fit(["happy cats", "sad dogs"])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            url = os.path.join(tmp, "vectorizer.pkl")
+            with open(url, "wb") as file:
+                pickle.dump(vectorizer, file)
+
+            lemmatizer = CountingLemmatizer()
+            cache = LemmaCache(lemmatizer, max_size=1)
+            self.assertEqual(cache.warm_from_vectorizer(url), 4)
+
+        calls = lemmatizer.calls
+        for token in ["happy", "cats", "sad", "dogs"] * 3:
+            cache.lemmatize(token)
+
+        # Pinned tokens survive a tiny LRU and never reach the lemmatizer:
+        self.assertEqual(lemmatizer.calls, calls)
+        self.assertEqual(cache.lemmatize("cats"), "cat")
+        self.assertEqual(cache.stats()["misses"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
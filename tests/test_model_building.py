@@ -0,0 +1,153 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from scipy import sparse
+
+from src.data.data_io import write_matrix, write_vocabulary
+from src.model.model_building import (incremental_building, load_checkpoint, model_building, resolve_n_jobs,
+                                       save_checkpoint)
+
+PARAMS = {"c": 0.1, "max_iter": 150, "solver": "newton-cg", "tol": 1e-4, "n_jobs": 1}
+
+
+def synthetic_data(n_rows: int = 500, n_features: int = 50) -> tuple:
+    rng = np.random.default_rng(42)
+    x = sparse.random(n_rows, n_features, density=0.1, format="csr", random_state=42)
+    y = (x @ rng.normal(size=n_features) > 0).astype(int)
+    return x, y
+
+
+class TestModelBuilding(unittest.TestCase):
+
+    def test_fits_csr_and_records_training(self):
+        x, y = synthetic_data()
+        model, training = model_building(x, y, PARAMS)
+
+        self.assertEqual(model.solver, "newton-cg")
+        self.assertEqual((training["n_samples"], training["n_features"], training["nnz"]), (500, 50, x.nnz))
+        self.assertTrue(training["converged"])
+        self.assertGreater(training["n_iter"], 0)
+        self.assertGreater(training["fit_time"], 0)
+
+    def test_solvers_agree(self):
+        x, y = synthetic_data()
+        lbfgs, _ = model_building(x, y, dict(PARAMS, solver="lbfgs", tol=1e-8, max_iter=1000))
+        newton, _ = model_building(x, y, dict(PARAMS, tol=1e-8))
+
+        # Same objective, different optimizer:
+        np.testing.assert_allclose(lbfgs.coef_, newton.coef_, atol=1e-4)
+
+    def test_reports_non_convergence(self):
+        x, y = synthetic_data()
+        _, training = model_building(x, y, dict(PARAMS, solver="lbfgs", max_iter=1))
+
+        self.assertFalse(training["converged"])
+        self.assertEqual(training["n_iter"], 1)
+
+    def test_resolve_n_jobs(self):
+        cores = os.cpu_count() or 1
+        self.assertEqual(resolve_n_jobs(-1), cores)
+        self.assertEqual(resolve_n_jobs(-2), max(cores - 1, 1))
+        self.assertEqual(resolve_n_jobs(None), 1)
+        self.assertEqual(resolve_n_jobs(3), 3)
+
+        with self.assertRaises(ValueError):
+            resolve_n_jobs(0)
+
+
+class TestIncrementalBuilding(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.file_path = tmp.name
+
+        self.x, self.y = synthetic_data(2000)
+        self.params = {"incremental": {"batch_size": 300, "epochs": 3, "alpha": 1e-4,
+                                       "checkpoint": os.path.join(tmp.name, "checkpoint.pkl")}}
+        write_vocabulary([f"w{i}" for i in range(50)], self.file_path)
+
+    def train(self, n_rows: int, resume: bool = False, append_only: bool = True) -> tuple:
+        write_matrix(self.x[:n_rows], self.y[:n_rows], self.file_path, "train_bow")
+        params = dict(self.params, incremental=dict(self.params["incremental"], resume=resume))
+        return incremental_building(self.file_path, "train_bow", params, append_only=append_only)
+
+    def test_streams_all_rows(self):
+        model, training = self.train(2000)
+
+        self.assertEqual((training["rows_trained"], training["n_iter"]), (2000, 3))
+        self.assertGreater(model.score(self.x, self.y), 0.8)
+        self.assertEqual(load_checkpoint(self.params["incremental"]["checkpoint"])["rows_seen"], 2000)
+
+    def test_resume_trains_only_new_rows(self):
+        self.train(1500)
+        model, training = self.train(2000, resume=True)
+
+        self.assertTrue(training["resumed"])
+        self.assertEqual(training["rows_trained"], 500)
+        self.assertGreater(model.score(self.x, self.y), 0.8)
+
+        # Nothing new, nothing to do:
+        _, training = self.train(2000, resume=True)
+        self.assertEqual((training["rows_trained"], training["n_iter"]), (0, 0))
+
+    def test_resume_interrupted_epochs(self):
+        self.train(1000)
+        state = load_checkpoint(self.params["incremental"]["checkpoint"])
+        state.update(rows_seen=0, epochs_done=2)
+        save_checkpoint(self.params["incremental"]["checkpoint"], state)
+
+        _, training = self.train(1000, resume=True)
+        self.assertEqual(training["n_iter"], 1)
+
+    def test_resume_rejects_new_feature_space(self):
+        self.train(1000)
+        write_matrix(sparse.random(10, 60, density=0.1, format="csr"), np.arange(10) % 2,
+                     self.file_path, "train_bow")
+        params = dict(self.params, incremental=dict(self.params["incremental"], resume=True))
+
+        with self.assertRaises(ValueError):
+            incremental_building(self.file_path, "train_bow", params, append_only=True)
+
+    def test_resume_rejects_refit_vocabulary(self):
+        self.train(1000)
+
+        # Same column count, but the columns mean different words now:
+        write_vocabulary([f"w{i}" for i in reversed(range(50))], self.file_path)
+        with self.assertRaises(ValueError):
+            self.train(2000, resume=True)
+
+    def test_resume_rejects_removed_rows(self):
+        self.train(2000)
+        with self.assertRaises(ValueError):
+            self.train(1000, resume=True)
+
+    def test_resume_needs_append_only_ingestion(self):
+        self.train(1000)
+        with self.assertRaises(ValueError):
+            self.train(2000, resume=True, append_only=False)
+
+    def test_resume_needs_stable_feature_space(self):
+        self.train(1000)
+        params = dict(self.params, incremental=dict(self.params["incremental"], resume=True))
+
+        for features in [{"mode": "bow"}, {"mode": "hashing", "tfidf": True}]:
+            with self.assertRaises(ValueError):
+                incremental_building(self.file_path, "train_bow", params, append_only=True, features=features)
+
+        _, training = incremental_building(self.file_path, "train_bow", params, append_only=True,
+                                           features={"mode": "hashing", "tfidf": False})
+        self.assertTrue(training["resumed"])
+
+    def test_empty_checkpoint_starts_over(self):
+        save_checkpoint(self.params["incremental"]["checkpoint"], None)
+
+        _, training = self.train(1000, resume=True)
+        self.assertFalse(training["resumed"])
+        self.assertEqual(training["rows_trained"], 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from Fastapi.model_holder import ModelHolder
+
+TRAIN = ["happy day", "love sunshine", "great fun day", "sad day", "miss you", "tired sad"]
+LABELS = [1, 1, 1, 0, 0, 0]
+
+
+class TestModelHolder(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.vectorizer = CountVectorizer().fit(TRAIN)
+        x = pd.DataFrame(cls.vectorizer.transform(TRAIN).toarray(),
+                         columns=cls.vectorizer.get_feature_names_out())
+        cls.model = LogisticRegression().fit(x, LABELS)
+        cls.holder = ModelHolder(cls.model, cls.vectorizer)
+
+    def test_feature_names_cached(self):
+        self.assertEqual(list(self.holder.feature_names), list(self.vectorizer.get_feature_names_out()))
+
+    def test_sparse_scoring_matches_dense_frame(self):
+        texts = ["happy sunshine", "sad tired day", "unknown words only"]
+        dense = pd.DataFrame(self.vectorizer.transform(texts).toarray(),
+                             columns=self.vectorizer.get_feature_names_out())
+
+        np.testing.assert_array_equal(self.holder.predict(texts), self.model.predict(dense))
+        np.testing.assert_allclose(self.holder.predict_proba(texts),
+                                   self.model.predict_proba(dense)[:, 1])
+
+    def test_score_matches_predict(self):
+        texts = ["happy sunshine", "sad tired day", "great fun", "miss"]
+        labels, probabilities = self.holder.score(texts)
+
+        np.testing.assert_array_equal(labels, self.holder.predict(texts))
+        np.testing.assert_allclose(probabilities, self.holder.predict_proba(texts))
+
+
+if __name__ == "__main__":
+    unittest.main()
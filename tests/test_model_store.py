@@ -0,0 +1,116 @@
+import contextlib
+import io
+import os
+import pickle
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from mlflow.exceptions import MlflowException
+
+from Fastapi.model_store import LocalModelStore, fetch_vectorizer, file_sha256
+
+TRAIN = ["happy day", "love sunshine", "sad day", "miss you"]
+LABELS = [1, 1, 0, 0]
+
+
+class TestLocalModelStore(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+
+        self.vectorizer = CountVectorizer().fit(TRAIN)
+        self.model = LogisticRegression().fit(self.vectorizer.transform(TRAIN), LABELS)
+
+        self.vectorizer_url = os.path.join(tmp.name, "vectorizer.pkl")
+        with open(self.vectorizer_url, "wb") as file:
+            pickle.dump(self.vectorizer, file)
+
+        self.tmp = tmp.name
+        self.store = LocalModelStore(os.path.join(tmp.name, "store"))
+
+    def test_materialize_and_load(self):
+        self.assertFalse(self.store.exists())
+
+        manifest = self.store.materialize(self.model, self.vectorizer_url, 3, source="models:/emotion_detection/3")
+        holder = self.store.load()
+
+        self.assertEqual(self.store.current_version(), "3")
+        self.assertEqual(set(manifest["files"]), {"model.pkl", "vectorizer.pkl", "scoring/vocabulary.npy", "scoring/coef.npy",
+                                                  "scoring/intercept.npy", "scoring/classes.npy",
+                                                  "scoring/config.json"})
+        self.assertEqual(holder.version, "3")
+        np.testing.assert_array_equal(holder.predict(["happy sunshine", "sad"]),
+                                      self.model.predict(self.vectorizer.transform(["happy sunshine", "sad"])))
+
+    def test_new_version_moves_pointer(self):
+        self.store.materialize(self.model, self.vectorizer_url, 3)
+        self.store.materialize(self.model, self.vectorizer_url, 4)
+
+        self.assertEqual(self.store.current_version(), "4")
+        self.assertEqual(self.store.load("3").version, "3")
+
+    def test_checksum_mismatch(self):
+        self.store.materialize(self.model, self.vectorizer_url, 3)
+
+        with open(os.path.join(self.store.root, "3", "model.pkl"), "ab") as file:
+            file.write(b"corrupted")
+
+        with self.assertRaises(ValueError):
+            self.store.load()
+
+    def test_load_without_version(self):
+        with self.assertRaises(FileNotFoundError):
+            self.store.load()
+
+    def test_rejects_vectorizer_of_another_model(self):
+        other_url = os.path.join(self.tmp, "other.pkl")
+        with open(other_url, "wb") as file:
+            pickle.dump(CountVectorizer().fit(["just two"]), file)
+
+        with self.assertRaises(ValueError):
+            self.store.materialize(self.model, other_url, 3)
+        self.assertFalse(os.path.exists(self.store.root))
+
+
+class TestFetchVectorizer(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+
+        self.local_url = os.path.join(tmp.name, "local.pkl")
+        self.logged_url = os.path.join(tmp.name, "logged.pkl")
+        for url, texts in ((self.local_url, ["happy day"]), (self.logged_url, ["sad day"])):
+            with open(url, "wb") as file:
+                pickle.dump(CountVectorizer().fit(texts), file)
+
+    def fetch(self, tags: dict, logged: bool = True) -> str:
+        model_version = SimpleNamespace(version="4", run_id="run", tags=tags)
+        download = mock.Mock(return_value=self.logged_url) if logged else \
+            mock.Mock(side_effect=MlflowException("no such artifact"))
+        with mock.patch("mlflow.artifacts.download_artifacts", download), \
+                contextlib.redirect_stdout(io.StringIO()):
+            return fetch_vectorizer(model_version, self.local_url, self.tmp)
+
+    def test_prefers_logged_vectorizer(self):
+        self.assertEqual(self.fetch({"vectorizer_sha256": file_sha256(self.logged_url)}), self.logged_url)
+
+    def test_falls_back_to_matching_local_vectorizer(self):
+        tags = {"vectorizer_sha256": file_sha256(self.local_url)}
+        self.assertEqual(self.fetch(tags, logged=False), self.local_url)
+
+    def test_rejects_local_vectorizer_of_another_run(self):
+        with self.assertRaises(ValueError):
+            self.fetch({"vectorizer_sha256": file_sha256(self.logged_url)}, logged=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
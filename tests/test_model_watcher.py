@@ -0,0 +1,126 @@
+import json
+import os
+import pickle
+import tempfile
+import time
+import unittest
+
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from Fastapi.model_store import LocalModelStore
+from Fastapi.model_watcher import ModelWatcher, score_with_holders
+
+TRAIN = ["happy day", "love sunshine", "sad day", "miss you"]
+
+
+class FileRegistry:
+    """Local stand-in for the model registry: pickled models plus an alias file."""
+
+    def __init__(self, root: str, vectorizer_url: str):
+        self.root = root
+        self.vectorizer_url = vectorizer_url
+        self.aliases_url = os.path.join(root, "aliases.json")
+
+    def register(self, model, version: str) -> None:
+        with open(os.path.join(self.root, f"{version}.pkl"), "wb") as file:
+            pickle.dump(model, file)
+
+    def set_alias(self, alias: str, version: str) -> None:
+        with open(self.aliases_url, "w") as file:
+            json.dump({alias: version}, file)
+
+    def refresh(self, store: LocalModelStore, alias: str = "champion") -> bool:
+        # Same contract as refresh_from_registry:
+        with open(self.aliases_url, "r") as file:
+            version = json.load(file)[alias]
+        if version == store.current_version():
+            return False
+
+        with open(os.path.join(self.root, f"{version}.pkl"), "rb") as file:
+            model = pickle.load(file)
+        store.materialize(model, self.vectorizer_url, version, source=f"file:{alias}")
+        return True
+
+
+class TestModelWatcher(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+
+        vectorizer = CountVectorizer().fit(TRAIN)
+        vectorizer_url = os.path.join(tmp.name, "vectorizer.pkl")
+        with open(vectorizer_url, "wb") as file:
+            pickle.dump(vectorizer, file)
+
+        # Version 2 flips every label of version 1:
+        x = vectorizer.transform(TRAIN)
+        self.registry = FileRegistry(tmp.name, vectorizer_url)
+        self.registry.register(LogisticRegression(C=10).fit(x, [1, 1, 0, 0]), "1")
+        self.registry.register(LogisticRegression(C=10).fit(x, [0, 0, 1, 1]), "2")
+        self.registry.set_alias("champion", "1")
+
+        self.store = LocalModelStore(os.path.join(tmp.name, "store"))
+        self.registry.refresh(self.store)
+        self.watcher = ModelWatcher(self.store, self.store.load(),
+                                    refresh_fn=lambda: self.registry.refresh(self.store), interval=0.01)
+
+    def test_no_change(self):
+        self.assertFalse(self.watcher.check())
+        self.assertEqual(self.watcher.status()["version"], "1")
+
+    def test_swaps_when_alias_moves(self):
+        old = self.watcher.holder
+        self.registry.set_alias("champion", "2")
+
+        self.assertTrue(self.watcher.check())
+        self.assertEqual(self.watcher.holder.version, "2")
+        self.assertEqual(self.watcher.status()["reloads"], 1)
+
+        # Requests that already hold the old model can still finish with it:
+        self.assertEqual(old.predict(["happy day"])[0], 1)
+        self.assertEqual(self.watcher.holder.predict(["happy day"])[0], 0)
+
+    def test_batch_spanning_a_swap(self):
+        old = self.watcher.holder
+        self.registry.set_alias("champion", "2")
+        self.watcher.check()
+
+        # Queued before and after the swap, each scored by its own model:
+        labels, _ = score_with_holders([(old, "happy day"), (self.watcher.holder, "happy day"),
+                                        (old, "sad day")])
+        self.assertEqual([int(label) for label in labels], [1, 0, 0])
+
+    def test_broken_version_is_not_served(self):
+        self.registry.set_alias("champion", "2")
+        self.registry.refresh(self.store)
+        with open(os.path.join(self.store.root, "2", "model.pkl"), "ab") as file:
+            file.write(b"corrupted")
+
+        self.assertFalse(self.watcher.check())
+        self.assertEqual(self.watcher.holder.version, "1")
+        self.assertIn("Checksum mismatch", self.watcher.status()["last_error"])
+
+    def test_failed_warmup_is_not_served(self):
+        self.registry.set_alias("champion", "2")
+        watcher = ModelWatcher(self.store, self.watcher.holder, refresh_fn=lambda: self.registry.refresh(self.store),
+                               warmup_texts=["happy"])
+        watcher.warmup = lambda candidate: candidate.score(None)
+
+        self.assertFalse(watcher.check())
+        self.assertEqual(watcher.holder.version, "1")
+
+    def test_background_thread(self):
+        self.watcher.start()
+        self.addCleanup(self.watcher.stop)
+        self.registry.set_alias("champion", "2")
+
+        deadline = time.monotonic() + 5
+        while self.watcher.holder.version != "2" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.watcher.holder.version, "2")
+
+
+if __name__ == "__main__":
+    unittest.main()
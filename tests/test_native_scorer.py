@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from Fastapi.native_scorer import NativeScorer, export_scoring_artifact
+
+TRAIN = ["happy day", "love sunshine today", "sad day", "miss you so much", "happy happy joy", "alone again today"]
+LABELS = [1, 1, 0, 0, 1, 0]
+TEXTS = ["happy sunshine", "Sad, sad DAY!", "unknown words only", "", "miss miss you happy"]
+
+
+class TestNativeScorer(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.url = os.path.join(tmp.name, "scoring")
+
+        self.vectorizer = CountVectorizer().fit(TRAIN)
+        self.model = LogisticRegression(C=10).fit(self.vectorizer.transform(TRAIN), LABELS)
+
+    def test_matches_sklearn(self):
+        export_scoring_artifact(self.model, self.vectorizer, self.url)
+        scorer = NativeScorer.load(self.url, version="1")
+        features = self.vectorizer.transform(TEXTS)
+
+        np.testing.assert_allclose(scorer.decision_function(TEXTS), self.model.decision_function(features))
+        np.testing.assert_allclose(scorer.predict_proba(TEXTS), self.model.predict_proba(features)[:, 1])
+        np.testing.assert_array_equal(scorer.predict(TEXTS), self.model.predict(features))
+
+        labels, probabilities = scorer.score(TEXTS)
+        np.testing.assert_array_equal(labels, self.model.predict(features))
+        self.assertEqual(scorer.version, "1")
+
+    def test_memory_mapped(self):
+        export_scoring_artifact(self.model, self.vectorizer, self.url)
+        scorer = NativeScorer.load(self.url, mmap=True)
+        features = self.vectorizer.transform(TEXTS)
+
+        self.assertIsInstance(scorer.coef, np.memmap)
+        self.assertIsNone(scorer.index)
+        np.testing.assert_allclose(scorer.predict_proba(TEXTS), self.model.predict_proba(features)[:, 1])
+        np.testing.assert_array_equal(scorer.predict(TEXTS), self.model.predict(features))
+
+    def test_rejects_unsupported_vectorizers(self):
+        bigrams = CountVectorizer(ngram_range=(1, 2)).fit(TRAIN)
+        model = LogisticRegression().fit(bigrams.transform(TRAIN), LABELS)
+
+        with self.assertRaises(ValueError):
+            export_scoring_artifact(model, bigrams, self.url)
+        with self.assertRaises(ValueError):
+            export_scoring_artifact(model, HashingVectorizer(), self.url)
+
+
+if __name__ == "__main__":
+    unittest.main()
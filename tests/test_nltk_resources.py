@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from src.data.nltk_resources import ensure_corpora
+
+
+class TestEnsureCorpora(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.download_dir = tmp.name
+
+    def test_local_corpus_skips_download(self):
+        os.makedirs(os.path.join(self.download_dir, "corpora", "local_corpus"))
+
+        with mock.patch("nltk.download") as download:
+            ensure_corpora(("local_corpus",), self.download_dir)
+        download.assert_not_called()
+
+    def test_missing_corpus_is_downloaded_once(self):
+        with mock.patch("nltk.download") as download:
+            ensure_corpora(("missing_corpus",), self.download_dir, offline=False)
+            ensure_corpora(("missing_corpus",), self.download_dir, offline=False)
+        download.assert_called_once_with("missing_corpus", download_dir=self.download_dir, quiet=True)
+
+    def test_offline_missing_corpus(self):
+        with self.assertRaises(LookupError):
+            ensure_corpora(("missing_corpus",), self.download_dir, offline=True)
+
+    def test_imports_are_lazy(self):
+        # Importing the modules alone must not pull in NLTK or touch the network:
+        code = ("import sys; import Fastapi.preprocessing, src.data.data_preprocessing; "
+                "print('nltk' in sys.modules)")
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                env=dict(os.environ, PYTHONPATH=os.getcwd())).stdout
+        self.assertEqual(output.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
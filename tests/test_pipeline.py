@@ -0,0 +1,110 @@
+import contextlib
+import filecmp
+import io
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from src import pipeline
+from src.data import data_ingestion, data_preprocessing
+from src.data.data_io import read_matrix
+from src.features import feature_engineering
+from src.model import model_building
+from test_text_normalizer import has_corpora
+
+PARAMS = {
+    "storage": {"format": "csv"},
+    "data_ingestion": {"source": "emotion.csv", "cache_dir": ".cache/datasets", "cache_max_age": 86400,
+                       "offline": True, "test_size": 0.4, "streaming": False, "chunk_size": 1000},
+    "data_preprocessing": {"lemma_cache_size": 1000, "n_jobs": 1, "chunk_size": 1000, "vectorized": False},
+    "feature_engineering": {"mode": "bow", "max_features": 50, "n_jobs": 1, "chunk_size": 1000},
+    "model_building": {"c": 0.1, "max_iter": 150, "solver": "newton-cg", "tol": 1e-4, "n_jobs": 1,
+                       "mode": "batch", "incremental": {"checkpoint": "models/checkpoint.pkl"}},
+}
+
+
+def write_dataset(url: str, n_rows: int = 400) -> None:
+    rng = np.random.default_rng(42)
+    happy, sad = ["love", "happy", "sunshine", "friends"], ["sad", "miss", "tired", "worst"]
+    filler = ["the", "day", "today", "work", "123", "!!!"]
+    rows = []
+    for i in range(n_rows):
+        sentiment = rng.choice(["happiness", "sadness", "worry"])
+        words = list(rng.choice(happy if sentiment == "happiness" else sad, 2)) + list(rng.choice(filler, 3))
+        # Some texts normalize to nothing and get dropped from csv:
+        content = "the 123" if i % 50 == 0 else " ".join(words)
+        rows.append({"tweet_id": i, "sentiment": sentiment, "content": content})
+    pd.DataFrame(rows).to_csv(url, index=False)
+
+
+class TestPipeline(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(tmp.name)
+
+        os.makedirs("models")
+        write_dataset("emotion.csv")
+        with open("params.yaml", "w") as file:
+            yaml.safe_dump(PARAMS, file)
+
+    def test_as_stored_matches_csv_round_trip(self):
+        df = pd.DataFrame({"content": ["happy day", "", "sad", "null", "nan", "none"],
+                           "sentiment": [1, 0, 0, 1, 0, 1]}, index=[7, 3, 5, 2, 4, 6])
+        stored = pipeline.as_stored(df, "csv")
+
+        self.assertEqual(list(stored.index), [0, 1, 2, 3, 4, 5])
+        self.assertTrue(np.isnan(stored.loc[1, "content"]))
+
+        # read_csv's default NA strings are dropped like in the staged run:
+        self.assertEqual(list(stored.dropna()["content"]), ["happy day", "sad", "none"])
+        self.assertEqual(pipeline.as_stored(df, "parquet").loc[1, "content"], "")
+
+    @unittest.skipUnless(has_corpora(), "NLTK stopwords/wordnet corpora are not installed.")
+    def test_matches_stage_by_stage_outputs(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            for stage in (data_ingestion, data_preprocessing, feature_engineering, model_building):
+                stage.main()
+        shutil.move("data", "staged_data")
+        shutil.move("models", "staged_models")
+        os.makedirs("models")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = pipeline.run(tracking=False)
+
+        for name in ("raw", "interim", "processed"):
+            comparison = filecmp.dircmp(os.path.join("staged_data", name), os.path.join("data", name))
+            self.assertEqual(comparison.left_only + comparison.right_only, [])
+            _, mismatch, errors = filecmp.cmpfiles(comparison.left, comparison.right, comparison.common_files,
+                                                   shallow=False)
+            # npz members carry timestamps, compare the matrices below:
+            self.assertEqual([name for name in mismatch + errors if not name.endswith(".npz")], [])
+
+        x_staged, y_staged = read_matrix("staged_data/processed", "train_bow")
+        x_fused, y_fused = read_matrix("data/processed", "train_bow")
+        self.assertEqual((x_staged != x_fused).nnz, 0)
+        np.testing.assert_array_equal(y_staged, y_fused)
+
+        with open("staged_models/model.pkl", "rb") as file:
+            staged = pickle.load(file)
+        with open("models/model.pkl", "rb") as file:
+            fused = pickle.load(file)
+        np.testing.assert_array_equal(staged.coef_, fused.coef_)
+
+        with open("reports/metrics.json") as file:
+            self.assertEqual(json.load(file), result["metrics"])
+        self.assertEqual(list(result["timings"]), ["data_ingestion", "data_preprocessing", "feature_engineering",
+                                                   "model_building", "model_evaluation"])
+
+
+if __name__ == "__main__":
+    unittest.main()
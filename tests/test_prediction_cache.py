@@ -0,0 +1,119 @@
+import time
+import unittest
+
+from Fastapi.prediction_cache import CacheBackend, LocalBackend, PredictionCache
+
+
+class SharedDictBackend(CacheBackend):
+    """Stand-in for a shared store: several caches point at one dict."""
+
+    def __init__(self, store: dict):
+        super().__init__()
+        self.store = store
+
+    def get(self, key: str):
+        return self.store.get(key)
+
+    def set(self, key: str, value: tuple) -> None:
+        self.store[key] = value
+
+    def clear(self) -> None:
+        self.store.clear()
+
+
+class TestPredictionCache(unittest.TestCase):
+
+    def test_hits_and_misses(self):
+        cache = PredictionCache(LocalBackend(max_size=10))
+
+        self.assertIsNone(cache.get("happy day", "1"))
+        cache.set("happy day", (1, 0.9), "1")
+        self.assertEqual(cache.get("happy day", "1"), (1, 0.9))
+
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_lru_eviction(self):
+        cache = PredictionCache(LocalBackend(max_size=2))
+
+        for text in ["a", "b"]:
+            cache.set(text, (0, 0.1), "1")
+        cache.get("a", "1")
+        cache.set("c", (1, 0.8), "1")
+
+        # "b" was least recently used:
+        self.assertIsNone(cache.get("b", "1"))
+        self.assertIsNotNone(cache.get("a", "1"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_ttl_expiry(self):
+        cache = PredictionCache(LocalBackend(ttl=0.01))
+        cache.set("sad", (0, 0.2), "1")
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get("sad", "1"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_new_model_version_scopes_keys(self):
+        backend = LocalBackend()
+        cache = PredictionCache(backend)
+        cache.set("happy", (1, 0.9), "1")
+
+        self.assertIsNone(cache.get("happy", "2"))
+        self.assertEqual(cache.stats()["invalidations"], 1)
+
+        # The old entry is left for the LRU/TTL, not cleared:
+        self.assertEqual(len(backend), 1)
+
+    def test_stale_version_does_not_move_back(self):
+        backend = LocalBackend()
+        cache = PredictionCache(backend)
+        cache.get("happy", "1")
+        cache.get("happy", "2")
+
+        # A request that started on model 1 finishes after the swap:
+        cache.set("happy", (0, 0.4), "1")
+        cache.set("happy", (1, 0.9), "2")
+
+        self.assertEqual(cache.stats()["version"], "2")
+        self.assertEqual(cache.stats()["invalidations"], 1)
+        self.assertIsNone(cache.get("happy", "1"))
+        self.assertEqual(cache.get("happy", "2"), (1, 0.9))
+
+    def test_current_version_callable(self):
+        served = {"version": "1"}
+        cache = PredictionCache(LocalBackend(), current_version=lambda: served["version"])
+        cache.get("happy", "1")
+        served["version"] = "2"
+
+        cache.set("happy", (0, 0.4), "1")
+        self.assertIsNone(cache.get("happy", "1"))
+
+        # Rolling back to 1 makes it current again:
+        served["version"] = "1"
+        cache.set("happy", (0, 0.4), "1")
+        self.assertEqual(cache.get("happy", "1"), (0, 0.4))
+        self.assertEqual(cache.stats()["invalidations"], 2)
+
+    def test_partial_backend_fails_on_construction(self):
+        class GetOnlyBackend(CacheBackend):
+            def get(self, key: str):
+                return None
+
+        with self.assertRaises(TypeError):
+            GetOnlyBackend()
+
+    def test_shared_backend(self):
+        store = {}
+        first = PredictionCache(SharedDictBackend(store))
+        second = PredictionCache(SharedDictBackend(store))
+
+        first.set("happy", (1, 0.9), "1")
+        self.assertEqual(second.get("happy", "1"), (1, 0.9))
+
+        # Version scoped keys keep another model's entries out:
+        self.assertIsNone(second.get("happy", "2"))
+
+
+if __name__ == "__main__":
+    unittest.main()
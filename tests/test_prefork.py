@@ -0,0 +1,40 @@
+import os
+import time
+import unittest
+
+from Fastapi.prefork import process_memory, refresh_in_background
+
+
+class TestProcessMemory(unittest.TestCase):
+
+    def test_own_process(self):
+        memory = process_memory()
+
+        self.assertEqual(memory["pid"], os.getpid())
+        self.assertGreater(memory["rss_mb"], 0)
+        self.assertLessEqual(memory["uss_mb"], memory["pss_mb"])
+        self.assertLessEqual(memory["pss_mb"], memory["rss_mb"])
+
+
+def slow_refresh():
+    time.sleep(0.5)
+
+
+class TestRefreshInBackground(unittest.TestCase):
+
+    def test_one_refresh_at_a_time(self):
+        # Returns while the refresh is still running, in another process:
+        process = refresh_in_background(target=slow_refresh)
+        self.assertIs(refresh_in_background(process, target=slow_refresh), process)
+        self.assertNotEqual(process.pid, os.getpid())
+
+        process.join()
+        self.assertEqual(process.exitcode, 0)
+
+        again = refresh_in_background(process, target=slow_refresh)
+        self.assertIsNot(again, process)
+        again.join()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+
+import nltk
+import pandas as pd
+
+from src.data import data_preprocessing
+from src.data.text_normalizer import TextNormalizer
+
+
+def has_corpora() -> bool:
+    try:
+        nltk.data.find("corpora/stopwords")
+        nltk.data.find("corpora/wordnet")
+    except LookupError:
+        return False
+    return True
+
+
+def legacy_normalize(content: str) -> str:
+    content = data_preprocessing.lower_case(content)
+    content = data_preprocessing.remove_stop_words(content)
+    content = data_preprocessing.removing_numbers(content)
+    content = data_preprocessing.removing_punctuations(content)
+    content = data_preprocessing.removing_urls(content)
+    content = data_preprocessing.lemmatization(content)
+    return content
+
+
+SAMPLES = [
+    "Layin n bed with a headache  ughhhh...waitin on your call...",
+    "@tiffanylue i know  i was listenin to bad habit earlier",
+    "Funeral ceremony...gloomy friday...",
+    "wants to hang out with friends SOON! http://bit.ly/abc123 www.example.com",
+    "I'm DON'T won't can't 2day is the 1st of May ²³ Ⅻ",
+    "cats,dogs;mice:geese -- leaves\tand\nwolves   ",
+    "",
+    "   ",
+    "!!! ??? 12345",
+    "ÇA VA? İstanbul straße naïve café",
+    "should've been there i2 a1b2c3",
+]
+
+
+@unittest.skipUnless(has_corpora(), "NLTK stopwords/wordnet corpora are not installed.")
+class TestTextNormalizer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.normalizer = TextNormalizer()
+
+    def test_matches_legacy_pipeline(self):
+        for text in SAMPLES:
+            with self.subTest(text=text):
+                self.assertEqual(self.normalizer.normalize(text), legacy_normalize(text))
+
+    def test_dataframe_normalize_text(self):
+        df = pd.DataFrame({"content": SAMPLES})
+        expected = [legacy_normalize(text) for text in SAMPLES]
+
+        result = data_preprocessing.normalize_text(df)
+
+        self.assertEqual(result.content.tolist(), expected)
+
+    def test_vectorized_matches_legacy_functions(self):
+        df = pd.DataFrame({"content": SAMPLES})
+        expected = [legacy_normalize(text) for text in SAMPLES]
+
+        result = data_preprocessing.normalize_text_vectorized(df, self.normalizer)
+
+        self.assertEqual(result.content.tolist(), expected)
+
+    def test_parallel_matches_serial(self):
+        train = pd.DataFrame({"content": SAMPLES * 7, "sentiment": range(len(SAMPLES) * 7)})
+        test = pd.DataFrame({"content": SAMPLES[::-1], "sentiment": range(len(SAMPLES))})
+        expected_train = [legacy_normalize(text) for text in train.content]
+        expected_test = [legacy_normalize(text) for text in test.content]
+
+        # Chunk size divides neither frame evenly:
+        train, test = data_preprocessing.normalize_text_parallel(
+            [train, test], n_jobs=3, chunk_size=4)
+
+        self.assertEqual(train.content.tolist(), expected_train)
+        self.assertEqual(test.content.tolist(), expected_test)
+        self.assertEqual(train.sentiment.tolist(), list(range(len(SAMPLES) * 7)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,7 @@ from sklearn.metrics import accuracy_score, recall_score, precision_score, f1_sc
 import pandas as pd
 
 from Fastapi.preprocessing import normalize_text
+from src.data.data_io import read_matrix, read_vocabulary
 
 class TestModelLoading(unittest.TestCase):
 
@@ -35,7 +36,8 @@ class TestModelLoading(unittest.TestCase):
             cls.vectorizer = pickle.load(file)
 
         # Load holdout data:
-        cls.holdout_data = pd.read_csv("data/processed/test_bow.csv")
+        cls.holdout_x, cls.holdout_y = read_matrix("data/processed", "test_bow")
+        cls.holdout_columns = read_vocabulary("data/processed")
 
 
 
@@ -66,8 +68,8 @@ class TestModelLoading(unittest.TestCase):
         self.assertEqual(len(prediction.shape), 1)
 
     def test_model_performance(self):
-        X = self.holdout_data.drop(columns=["sentiment"])
-        y = self.holdout_data["sentiment"]
+        X = pd.DataFrame(self.holdout_x.toarray(), columns=self.holdout_columns)
+        y = self.holdout_y
 
         y_pred = self.model.predict(X)
 